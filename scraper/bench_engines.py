@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+CPU, memory and tenders per minute of the two detail engines (Playwright render + one schema evaluate,
+and HTTP fetch + selectolax over the same schema) on saved tender pages. It also counts fields where the
+engines disagree.
+
+1. Capture fixtures once, logged in as EMAIL / PASSWORD. This saves the raw HTML of the
+   BENCH_FIXTURES most recent tenders in tenders.db:
+       BENCH_CAPTURE=1 python bench_engines.py
+2. Benchmark. Fixtures are served from a local HTTP server, and the browser is blocked from every
+   other host, so neither engine touches the network:
+       python bench_engines.py
+
+CPU is user + system time of this process and of every child it spawned (the Playwright driver and
+Chromium). Memory is the peak combined RSS of that process tree, sampled every 100 ms. Linux only.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import functools
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from playwright.async_api import async_playwright
+
+from main import USER_AGENT, BASE_URL, login, extract_tender_fields
+from fast_fetch import HttpEngine, parse_tender
+
+# ----------------- CONFIG -----------------
+FIXTURES_DIR = Path(os.getenv("BENCH_FIXTURES_DIR", "../data/raw/fixtures"))
+FIXTURES = int(os.getenv("BENCH_FIXTURES", "50"))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "4"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "3"))  # passes over the fixtures per engine
+DB_FILE = "../data/raw/tenders.db"
+LOG_FILE = "../data/raw/scrape_errors.log"
+# ------------------------------------------
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def process_tree(pid):
+    """`pid` and all of its descendants."""
+    parents = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        parents.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    found, stack = [pid], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def tree_usage(pid):
+    """(CPU seconds, RSS MB) summed over the live process tree of `pid`."""
+    cpu = rss = 0.0
+    for p in process_tree(pid):
+        try:
+            fields = Path(f"/proc/{p}/stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime, stime
+        rss += int(fields[21]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    return cpu, rss
+
+
+class UsageSampler:
+    """Peak RSS and the CPU seconds consumed by the process tree between start() and stop()."""
+
+    def __init__(self):
+        self.peak_rss = 0.0
+
+    async def _sample(self):
+        while True:
+            self.cpu, rss = tree_usage(os.getpid())
+            self.peak_rss = max(self.peak_rss, rss)
+            await asyncio.sleep(0.1)
+
+    def start(self):
+        self.cpu_start, self.peak_rss = tree_usage(os.getpid())
+        self.cpu = self.cpu_start
+        self.task = asyncio.create_task(self._sample())
+
+    def stop(self):
+        # Take the last sample while the browser is still alive; exited children drop out of /proc
+        self.cpu, rss = tree_usage(os.getpid())
+        self.peak_rss = max(self.peak_rss, rss)
+        self.task.cancel()
+        return self.cpu - self.cpu_start
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_fixtures():
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def run_pool(urls, worker):
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    results = {}
+
+    async def drain(slot):
+        while not queue.empty():
+            url = queue.get_nowait()
+            results[url] = await worker(slot, url)
+
+    await asyncio.gather(*(drain(slot) for slot in range(CONCURRENCY)))
+    return results
+
+
+async def bench_playwright(urls, origin):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT, viewport={"width": 1280, "height": 720})
+        # Site scripts and styles referenced by the saved pages would otherwise be fetched live
+        await context.route("**/*", lambda route: route.continue_() if route.request.url.startswith(origin) else route.abort())
+        pages = [await context.new_page() for _ in range(CONCURRENCY)]
+
+        async def worker(slot, url):
+            page = pages[slot]
+            await page.goto(url, timeout=60000)
+            await page.wait_for_load_state('networkidle', timeout=40000)
+            return await extract_tender_fields(page)
+
+        sampler = UsageSampler()
+        sampler.start()
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            fields = await run_pool(urls, worker)
+        elapsed = time.perf_counter() - start
+        cpu = sampler.stop()
+        await browser.close()
+    return fields, elapsed, cpu, sampler.peak_rss
+
+
+async def bench_http(urls):
+    engine = HttpEngine([], USER_AGENT, max_connections=CONCURRENCY)
+
+    async def worker(slot, url):
+        response = await engine.client.get(url)
+        return parse_tender(response.text)
+
+    sampler = UsageSampler()
+    sampler.start()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fields = await run_pool(urls, worker)
+    elapsed = time.perf_counter() - start
+    cpu = sampler.stop()
+    await engine.aclose()
+    return fields, elapsed, cpu, sampler.peak_rss
+
+
+def normalize(value):
+    return " ".join(value.split()) if isinstance(value, str) else value
+
+
+def mismatches(browser_fields, http_fields):
+    """{field: count} of fixtures where the engines extracted different values."""
+    counts = {}
+    for url, expected in browser_fields.items():
+        got = http_fields.get(url)
+        for name, value in expected.items():
+            if got is None or normalize(got.get(name)) != normalize(value):
+                counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+async def capture():
+    conn = sqlite3.connect(DB_FILE)
+    urls = [row[0] for row in conn.execute("SELECT url FROM tenders ORDER BY scrape_timestamp DESC LIMIT ?", (FIXTURES,))]
+    conn.close()
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT, viewport={"width": 1280, "height": 720})
+        if not await login(await context.new_page(), LOG_FILE):
+            await browser.close()
+            return
+        engine = await HttpEngine.from_context(context, USER_AGENT)
+        index = {}
+        for n, url in enumerate(urls):
+            response = await engine.client.get(url)
+            name = f"tender_{n}.html"
+            (FIXTURES_DIR / name).write_text(response.text, encoding="utf-8")
+            index[name] = url
+            await asyncio.sleep(1)  # same politeness as a scrape
+        (FIXTURES_DIR / "index.json").write_text(json.dumps(index, indent=2))
+        await engine.aclose()
+        await browser.close()
+    print(f"Saved {len(index)} fixtures from {BASE_URL} to {FIXTURES_DIR}")
+
+
+async def run():
+    names = sorted(json.loads((FIXTURES_DIR / "index.json").read_text()))
+    server, origin = serve_fixtures()
+    urls = [f"{origin}/{name}" for name in names]
+    try:
+        results = {}
+        browser_fields, *results["playwright"] = await bench_playwright(urls, origin)
+        http_fields, *results["http"] = await bench_http(urls)
+    finally:
+        server.shutdown()
+
+    report = {"fixtures": len(urls), "rounds": ROUNDS, "concurrency": CONCURRENCY, "engines": {}}
+    for engine, (elapsed, cpu, peak_rss) in results.items():
+        tenders = len(urls) * ROUNDS
+        report["engines"][engine] = {
+            "tenders_per_minute": round(tenders / elapsed * 60, 1),
+            "cpu_ms_per_tender": round(cpu / tenders * 1000, 2),
+            "peak_rss_mb": round(peak_rss, 1),
+        }
+        print(f"{engine:<11} {tenders / elapsed * 60:>9.1f} tenders/min  {cpu / tenders * 1000:>8.2f} CPU ms/tender  "
+              f"{peak_rss:>8.1f} MB peak RSS")
+    report["http_parse_failures"] = sum(1 for fields in http_fields.values() if fields is None)
+    report["field_mismatches"] = mismatches(browser_fields, http_fields)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(capture() if os.getenv("BENCH_CAPTURE") == "1" else run())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pages per minute of the old lock-step batch loop against the work-queue scheduler, on simulated
+pages so runs are repeatable and never touch the site.
+
+Each navigation costs a lognormal load time (median SIM_LOAD_MEDIAN seconds). A SIM_TIMEOUT_RATE
+fraction of loads hang for the full 60s goto timeout and are retried. The batch loop retries in
+place, as the old main.py did; the queue puts the job back on the queue. Every listing
+page has SIM_TENDERS_PER_PAGE new tenders. Time is compressed by SIM_SPEEDUP, and results are
+reported in simulated minutes.
+
+Usage (from scraper/):
+    python bench_scheduler.py
+    SIM_TIMEOUT_RATE=0.05 SCRAPER_WORKERS=8 python bench_scheduler.py
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+
+from scheduler import HostRateLimiter, PolitenessBudget, ScrapeScheduler, Throughput
+
+# ----------------- CONFIG -----------------
+PAGES = int(os.getenv("SIM_PAGES", "40"))
+WORKERS = int(os.getenv("SCRAPER_WORKERS", "6"))
+BATCH_PAGES = 4                                                 # concurrent_pages of the old loop
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "4"))
+REQUESTS_PER_MINUTE = float(os.getenv("REQUESTS_PER_MINUTE", "60"))
+TENDERS_PER_PAGE = int(os.getenv("SIM_TENDERS_PER_PAGE", "10"))
+LOAD_MEDIAN = float(os.getenv("SIM_LOAD_MEDIAN", "2.5"))        # seconds for goto + networkidle
+TIMEOUT_RATE = float(os.getenv("SIM_TIMEOUT_RATE", "0.02"))     # loads that hit the 60s goto timeout
+HOST_MIN_INTERVAL = float(os.getenv("HOST_MIN_INTERVAL", "1.0"))
+HOST_JITTER = float(os.getenv("HOST_JITTER", "0.5"))
+SPEEDUP = float(os.getenv("SIM_SPEEDUP", "200"))
+SEED = int(os.getenv("SIM_SEED", "3"))
+# ------------------------------------------
+
+HOST = "https://tender.example"
+
+
+async def sim_sleep(seconds):
+    await asyncio.sleep(seconds / SPEEDUP)
+
+
+async def sim_attempt(rng):
+    """One navigation; raises after the 60s goto timeout for a TIMEOUT_RATE fraction of loads."""
+    if rng.random() < TIMEOUT_RATE:
+        await sim_sleep(60)
+        raise TimeoutError("simulated goto timeout")
+    await sim_sleep(rng.lognormvariate(0, 0.5) * LOAD_MEDIAN)
+
+
+async def sim_load(rng):
+    """One navigation with the old in-place retry loop: up to 3 attempts, 2**attempt backoff."""
+    for attempt in range(3):
+        try:
+            return await sim_attempt(rng)
+        except TimeoutError:
+            await sim_sleep(2 ** attempt)
+
+
+def listing_links(page_num):
+    return [(f"tender {page_num}-{i}", f"{HOST}/tenders/{page_num}-{i}") for i in range(TENDERS_PER_PAGE)]
+
+
+async def batch_loop(rng, stats):
+    """The previous main(): batches of 4 pages, each scraping its details one by one."""
+
+    async def scrape_page(page_num):
+        await sim_load(rng)
+        for _ in listing_links(page_num):
+            await sim_load(rng)
+            stats.tenders += 1
+            await sim_sleep(rng.uniform(2, 3))
+        stats.pages += 1
+
+    for first in range(1, PAGES + 1, BATCH_PAGES):
+        await asyncio.gather(*(scrape_page(p) for p in range(first, min(first + BATCH_PAGES, PAGES + 1))))
+        await sim_sleep(rng.uniform(3, 5))
+
+
+async def queue_scheduler(rng, stats):
+    budget = PolitenessBudget(REQUESTS_PER_MINUTE * SPEEDUP, MAX_IN_FLIGHT,
+                              HostRateLimiter(HOST_MIN_INTERVAL / SPEEDUP, HOST_JITTER / SPEEDUP))
+
+    async def fetch_listing(page, page_num):
+        async with budget.request(HOST):
+            await sim_load(rng)
+        return True, listing_links(page_num)
+
+    async def fetch_detail(page, page_num, title, url):
+        async with budget.request(url):
+            await sim_attempt(rng)
+        return [title, url]
+
+    async def finish_listing(page_num, rows):
+        pass
+
+    scheduler = ScrapeScheduler(list(range(WORKERS)), fetch_listing, fetch_detail, finish_listing,
+                                failed_detail=lambda page_num, title, url, error: [title, url, "Error"],
+                                retry_backoff=1 / SPEEDUP, stats=stats)
+    await scheduler.run(range(1, PAGES + 1), lambda page_num, ok: True)
+
+
+async def measure(name, loop):
+    stats = Throughput()
+    start = time.monotonic()
+    await loop(random.Random(SEED), stats)
+    minutes = (time.monotonic() - start) * SPEEDUP / 60
+    return {
+        "scheduler": name,
+        "pages": stats.pages,
+        "tenders": stats.tenders,
+        "simulated_minutes": round(minutes, 2),
+        "pages_per_minute": round(stats.pages / minutes, 2),
+        "tenders_per_minute": round(stats.tenders / minutes, 2),
+    }
+
+
+async def run():
+    results = [await measure("batch", batch_loop), await measure("queue", queue_scheduler)]
+    for r in results:
+        print(f"{r['scheduler']:<6} {r['pages_per_minute']:>7} pages/min  {r['tenders_per_minute']:>8} tenders/min  "
+              f"({r['pages']} pages in {r['simulated_minutes']} simulated min)")
+    print(json.dumps({"workers": WORKERS, "max_in_flight": MAX_IN_FLIGHT, "requests_per_minute": REQUESTS_PER_MINUTE,
+                      "timeout_rate": TIMEOUT_RATE, "host_min_interval": HOST_MIN_INTERVAL, "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Inserts per second and event-loop stalls of the scraper bookkeeping: the old per-row commit on
+the event loop (default rollback journal) against StateStore (WAL, one group-committing writer).
+
+BENCH_PAGES concurrent "page tasks" each record BENCH_TENDERS_PER_PAGE tenders, then mark their
+page scraped, like the scheduler's workers. A probe task sleeps 1 ms in a loop; anything beyond that
+is time the event loop was blocked. Runs against a scratch database in the temp dir by default.
+Point BENCH_DB_DIR at the disk tenders.db lives on for representative fsync costs.
+
+Usage (from scraper/):
+    python bench_state_store.py
+"""
+
+import os
+import json
+import time
+import shutil
+import asyncio
+import sqlite3
+import tempfile
+
+from state_store import SCHEMA, INSERT_TENDER, MARK_PAGE, StateStore
+
+# ----------------- CONFIG -----------------
+PAGES = int(os.getenv("BENCH_PAGES", "200"))
+TENDERS_PER_PAGE = int(os.getenv("BENCH_TENDERS_PER_PAGE", "10"))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "6"))
+DB_DIR = os.getenv("BENCH_DB_DIR")
+# ------------------------------------------
+
+PROBE_INTERVAL = 0.001
+
+
+class StallProbe:
+    """Measures how late a 1 ms sleep wakes up, i.e. how long the loop was busy elsewhere."""
+
+    def __init__(self):
+        self.lags = []
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.lags.append(max(0.0, loop.time() - start - PROBE_INTERVAL))
+
+    def summary(self):
+        lags = sorted(self.lags) or [0.0]
+        return {
+            "stall_total_ms": round(sum(lags) * 1000, 1),
+            "stall_p99_ms": round(lags[min(len(lags) - 1, int(0.99 * len(lags)))] * 1000, 2),
+            "stall_max_ms": round(lags[-1] * 1000, 2),
+        }
+
+
+class LegacyStore:
+    """The previous bookkeeping: one blocking commit per row on the event loop."""
+
+    def __init__(self, db_file):
+        self.conn = sqlite3.connect(db_file)
+        self.conn.executescript(SCHEMA)
+
+    async def save_tender(self, url, title, timestamp, page_num):
+        self.conn.execute(INSERT_TENDER, (url, title, timestamp, page_num))
+        self.conn.commit()
+
+    async def mark_page_scraped(self, page_num):
+        self.conn.execute(MARK_PAGE, (page_num, time.strftime("%Y-%m-%d %H:%M:%S")))
+        self.conn.commit()
+
+    async def close(self):
+        self.conn.close()
+
+
+async def drive(store):
+    pages = asyncio.Queue()
+    for page_num in range(PAGES):
+        pages.put_nowait(page_num)
+
+    async def worker():
+        while not pages.empty():
+            page_num = pages.get_nowait()
+            for i in range(TENDERS_PER_PAGE):
+                await store.save_tender(f"https://bench.example/tenders/{page_num}-{i}", f"Tender {i}",
+                                        time.strftime("%Y-%m-%d %H:%M:%S"), page_num)
+                await asyncio.sleep(0)  # the scraper awaits page loads between rows
+            await store.mark_page_scraped(page_num)
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+
+async def measure(name, make_store, db_dir):
+    db_file = os.path.join(db_dir, f"{name}.db")
+    store = await make_store(db_file)
+    probe = StallProbe()
+    probe_task = asyncio.create_task(probe.run())
+    start = time.perf_counter()
+    await drive(store)
+    await store.close()
+    elapsed = time.perf_counter() - start
+    probe_task.cancel()
+    rows = PAGES * (TENDERS_PER_PAGE + 1)
+    return {"store": name, "writes": rows, "seconds": round(elapsed, 3),
+            "writes_per_second": round(rows / elapsed), **probe.summary()}
+
+
+async def legacy_store(db_file):
+    return LegacyStore(db_file)
+
+
+async def wal_store(db_file):
+    return await StateStore(db_file).open()
+
+
+async def run():
+    db_dir = tempfile.mkdtemp(dir=DB_DIR)
+    try:
+        results = [await measure("legacy", legacy_store, db_dir), await measure("wal_group_commit", wal_store, db_dir)]
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+    for r in results:
+        print(f"{r['store']:<18} {r['writes_per_second']:>8} writes/s  stall total {r['stall_total_ms']:>8} ms  "
+              f"p99 {r['stall_p99_ms']:>6} ms  max {r['stall_max_ms']:>6} ms")
+    print(json.dumps({"pages": PAGES, "tenders_per_page": TENDERS_PER_PAGE, "concurrency": CONCURRENCY,
+                      "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
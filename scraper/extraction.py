@@ -0,0 +1,75 @@
+"""
+Declarative extraction schema for tender pages, evaluated in a single round trip per page.
+
+Each field is a dict:
+    css      CSS selector. With `after`, it is searched inside the label's value div; without `css`,
+             the value div itself is the element.
+    after    emulates `div:has-text(after) + div`: the first div, in document order, whose previous
+             element sibling is a div containing `after` (case-insensitive, like :has-text)
+    text     keep only elements whose text contains this (like `a:has-text("Download")`)
+    read     "text" (inner text), "html" (inner HTML) or the name of an attribute
+    required the page counts as unparsed without it (used by the HTTP engine to fall back)
+A missing element reads as None. Adding a field is one schema entry. Under Playwright, the whole
+schema is a single page.evaluate; fast_fetch.py interprets the same schema over raw HTML.
+"""
+
+TENDER_SCHEMA = {
+    "title": {"css": "h1.text-xl.font-semibold", "read": "text", "required": True},
+    "closing_date": {"after": "Bid closing date", "read": "text", "required": True},
+    "published_on": {"after": "Published on", "read": "text"},
+    "region": {"after": "Region", "css": "a", "read": "text"},
+    "bidding_status": {"after": "Bidding", "css": "div.inline-flex", "read": "text"},
+    "description_html": {"css": "div.overflow-x-auto", "read": "html"},
+    "tor_href": {"css": "a", "text": "Download", "read": "href"},
+}
+
+# Every tender link on a listing page, one record per match
+LISTING_LINKS = {"css": "h3 a", "fields": {"title": "text", "href": "href"}}
+
+EXTRACT_JS = """
+({fields, records}) => {
+    const hasText = (el, text) =>
+        (el.textContent || "").replace(/\\s+/g, " ").toLowerCase().includes(text.toLowerCase());
+    const read = (el, how) =>
+        how === "text" ? el.innerText : how === "html" ? el.innerHTML : el.getAttribute(how);
+    const scopes = (spec) => spec.after
+        ? [...document.querySelectorAll("div")].filter((div) => {
+            const prev = div.previousElementSibling;
+            return prev !== null && prev.tagName === "DIV" && hasText(prev, spec.after);
+        })
+        : [document];
+    const find = (spec) => {
+        for (const scope of scopes(spec)) {
+            const candidates = spec.css ? scope.querySelectorAll(spec.css) : [scope];
+            for (const el of candidates) {
+                if (!spec.text || hasText(el, spec.text)) return el;
+            }
+        }
+        return null;
+    };
+    if (records) {
+        return [...document.querySelectorAll(records.css)].map((el) =>
+            Object.fromEntries(Object.entries(records.fields).map(([name, how]) => [name, read(el, how)])));
+    }
+    const out = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const el = find(spec);
+        out[name] = el === null ? null : read(el, spec.read || "text");
+    }
+    return out;
+}
+"""
+
+
+async def evaluate_fields(page, schema=TENDER_SCHEMA):
+    """{field: value or None} for the page loaded in `page`, in one evaluate call."""
+    return await page.evaluate(EXTRACT_JS, {"fields": schema, "records": None})
+
+
+async def evaluate_records(page, spec=LISTING_LINKS):
+    """One {field: value} dict per element matching spec["css"], in one evaluate call."""
+    return await page.evaluate(EXTRACT_JS, {"fields": None, "records": spec})
+
+
+def missing_required(fields, schema=TENDER_SCHEMA):
+    return [name for name, spec in schema.items() if spec.get("required") and not fields.get(name)]
@@ -0,0 +1,120 @@
+"""
+HTTP fetch engine: listing and tender pages fetched as raw HTML over one pooled httpx client and
+parsed with selectolax, reusing the logged-in browser session's cookies. It needs no render, no
+networkidle wait and no per-field IPC round trips.
+
+Fields come from the same schema the browser path evaluates (extraction.py), interpreted here
+over the lexbor tree. Texts are whitespace-collapsed to match inner_text. When a page lacks a
+required field (client-rendered markup, expired session, layout change), the parse functions
+return nothing and main.py falls back to the browser.
+"""
+
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+
+from extraction import LISTING_LINKS, TENDER_SCHEMA, missing_required
+
+
+def collapse(text):
+    return " ".join(text.split())
+
+
+def text_of(node):
+    return collapse(node.text(deep=True, separator=" ")) if node is not None else None
+
+
+def has_text(node, label):
+    return label.lower() in collapse(node.text(deep=True) or "").lower()
+
+
+def next_divs_after(tree, label):
+    """Every `div:has-text(label) + div`, in document order."""
+    for div in tree.css("div"):
+        prev = div.prev
+        while prev is not None and prev.tag in ("-text", "-comment"):
+            prev = prev.prev
+        if prev is not None and prev.tag == "div" and has_text(prev, label):
+            yield div
+
+
+def descendants(scope, css):
+    """querySelectorAll semantics: matches below `scope`, never `scope` itself."""
+    if isinstance(scope, LexborHTMLParser):
+        yield from scope.css(css)
+        return
+    for child in scope.iter():
+        yield from child.css(css)
+
+
+def find(tree, spec):
+    scopes = next_divs_after(tree, spec["after"]) if "after" in spec else [tree]
+    for scope in scopes:
+        candidates = descendants(scope, spec["css"]) if "css" in spec else [scope]
+        for node in candidates:
+            if "text" not in spec or has_text(node, spec["text"]):
+                return node
+    return None
+
+
+def read(node, how):
+    if how == "text":
+        return text_of(node)
+    if how == "html":
+        return node.inner_html
+    return node.attributes.get(how)
+
+
+def parse_listing(html, spec=LISTING_LINKS):
+    """(title, href) of each tender link on a listing page."""
+    tree = LexborHTMLParser(html)
+    return [(read(node, spec["fields"]["title"]), read(node, spec["fields"]["href"])) for node in tree.css(spec["css"])]
+
+
+def parse_tender(html, schema=TENDER_SCHEMA):
+    """Tender detail fields (None where not found), or None if a required field is missing."""
+    tree = LexborHTMLParser(html)
+    fields = {}
+    for name, spec in schema.items():
+        node = find(tree, spec)
+        fields[name] = read(node, spec.get("read", "text")) if node is not None else None
+    if missing_required(fields, schema):
+        return None
+    return fields
+
+
+class HttpEngine:
+    """Pooled async HTTP client carrying the browser context's cookies and user agent."""
+
+    def __init__(self, cookies, user_agent, max_connections=10):
+        jar = httpx.Cookies()
+        for cookie in cookies:
+            jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        self.client = httpx.AsyncClient(
+            cookies=jar,
+            headers={"User-Agent": user_agent},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(30.0),
+            follow_redirects=True,
+        )
+        self.fast = 0
+        self.fallbacks = 0
+
+    @classmethod
+    async def from_context(cls, context, user_agent, max_connections=10):
+        return cls(await context.cookies(), user_agent, max_connections)
+
+    async def fetch(self, url, budget):
+        async with budget.request(url):
+            response = await self.client.get(url)
+        response.raise_for_status()
+        if response.url.path.rstrip("/").endswith("/login"):
+            raise httpx.HTTPError(f"Session expired fetching {url}")
+        return response.text
+
+    def summary(self):
+        total = self.fast + self.fallbacks
+        share = self.fast / total * 100 if total else 0.0
+        return f"HTTP engine: {self.fast} pages parsed directly, {self.fallbacks} browser fallbacks ({share:.0f}% fast)"
+
+    async def aclose(self):
+        await self.client.aclose()
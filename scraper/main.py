@@ -1,9 +1,7 @@
 import asyncio
 import csv
 import os
-import random
 import time
-import sqlite3
 from dotenv import load_dotenv
 import os
 
@@ -12,8 +10,24 @@ load_dotenv()
 EMAIL = os.getenv("EMAIL")
 PASSWORD = os.getenv("PASSWORD")
 BASE_URL = os.getenv("BASE_URL", "https://tender.2merkato.com")
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "6"))           # long-lived browser pages pulling from the work queue
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "4"))               # page loads in progress at once, across all workers
+REQUESTS_PER_MINUTE = float(os.getenv("REQUESTS_PER_MINUTE", "60"))  # global page-load budget (0 = only per-host spacing)
+HOST_MIN_INTERVAL = float(os.getenv("HOST_MIN_INTERVAL", "1.0"))   # seconds between request starts to one host
+HOST_JITTER = float(os.getenv("HOST_JITTER", "0.5"))               # random extra spacing on top of the interval
+DETAIL_TIMEOUT = float(os.getenv("DETAIL_TIMEOUT", "120"))         # seconds one tender attempt may hold a worker
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL", "0.5"))  # seconds before queued bookkeeping writes are committed
+STATE_FLUSH_SIZE = int(os.getenv("STATE_FLUSH_SIZE", "200"))       # ... or once this many are queued
+STATE_QUEUE_SIZE = int(os.getenv("STATE_QUEUE_SIZE", "1000"))      # writes buffered before callers wait
+SCRAPER_ENGINE = os.getenv("SCRAPER_ENGINE", "playwright")         # "http": fetch raw HTML, browser only as fallback
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import httpx
+from extraction import LISTING_LINKS, TENDER_SCHEMA, evaluate_fields, evaluate_records
+from fast_fetch import HttpEngine, parse_listing, parse_tender
+from state_store import StateStore
+from scheduler import HostRateLimiter, PolitenessBudget, ScrapeScheduler, Throughput, report_periodically
 
 # Increase CSV field size limit
 csv.field_size_limit(10_000_000)
@@ -22,76 +36,10 @@ csv.field_size_limit(10_000_000)
 duplicate_count = 0
 DUPLICATE_LIMIT = 40  # Stop initial phase after 40 duplicates
 
-def init_db(db_file):
-    """Initialize SQLite database for storing tender URLs and page tracking."""
-    conn = sqlite3.connect(db_file)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tenders (
-            url TEXT PRIMARY KEY,
-            title TEXT,
-            scrape_timestamp TEXT,
-            page_num INTEGER
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS pages (
-            page_num INTEGER PRIMARY KEY,
-            scraped_timestamp TEXT
-        )
-    ''')
-    conn.commit()
-    return conn
-
-async def load_existing_urls(conn):
-    """Load existing tender URLs from SQLite database."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT url FROM tenders")
-    existing_urls = {row[0] for row in cursor.fetchall()}
-    print(f"Loaded {len(existing_urls)} existing URLs from database")
-    return existing_urls
-
-async def get_tender_count(conn):
-    """Get the total number of tenders in the database."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM tenders")
-    return cursor.fetchone()[0]
-
-async def is_page_scraped(conn, page_num):
-    """Check if a page has been fully scraped."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT 1 FROM pages WHERE page_num = ?", (page_num,))
-    return cursor.fetchone() is not None
-
-async def get_last_scraped_page(conn):
-    """Get the highest page number that has been fully scraped."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT MAX(page_num) FROM pages")
-    result = cursor.fetchone()[0]
-    return result if result is not None else 0
-
-async def mark_page_scraped(conn, page_num):
-    """Mark a page as fully scraped."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT OR REPLACE INTO pages (page_num, scraped_timestamp) VALUES (?, ?)",
-        (page_num, time.strftime("%Y-%m-%d %H:%M:%S"))
-    )
-    conn.commit()
-
-async def save_tender_to_db(conn, url, title, timestamp, page_num):
-    """Save a tender URL to the database with its page number."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT OR IGNORE INTO tenders (url, title, scrape_timestamp, page_num) VALUES (?, ?, ?, ?)",
-        (url, title, timestamp, page_num)
-    )
-    conn.commit()
-
-async def find_resume_page(conn, base_url, page, log_file):
+async def find_resume_page(store, base_url, page, log_file):
     """Find the page to resume scraping based on the last scraped page."""
-    tender_count = await get_tender_count(conn)
-    last_scraped_page = await get_last_scraped_page(conn)
+    tender_count = await store.get_tender_count()
+    last_scraped_page = await store.get_last_scraped_page()
 
     if tender_count == 0:
         print("No tenders in database, starting from page 1")
@@ -105,34 +53,31 @@ async def find_resume_page(conn, base_url, page, log_file):
     print(f"Calculated resume page: {resume_page} (last scraped: {last_scraped_page}, tenders: {tender_count})")
 
     # Verify tenders on the resume page
-    cursor = conn.cursor()
-    cursor.execute("SELECT url FROM tenders WHERE page_num = ? LIMIT 1", (resume_page,))
-    known_tender = cursor.fetchone()
+    known_tender = await store.first_tender_on_page(resume_page)
 
     url = f"{base_url}/tenders?categories=&page={resume_page}®ions=&sources="
     try:
         await page.goto(url, timeout=60000)
         await page.wait_for_load_state('networkidle', timeout=40000)
-        tenders = page.locator('h3 a')
-        count = await tenders.count()
-        print(f"Resume page {resume_page}: Found {count} tenders")
+        links = await evaluate_records(page, LISTING_LINKS)
+        print(f"Resume page {resume_page}: Found {len(links)} tenders")
 
         # Log page content if empty
-        if count == 0:
+        if not links:
             content = await page.content()
             with open(log_file, 'a', encoding='utf-8') as f:
                 f.write(f"Resume page {resume_page} empty, content:\n{content[:2000]}\n")
             await page.screenshot(path=f'resume_page_{resume_page}_debug.png')
             print(f"Resume page {resume_page}: Marked as scraped (empty)")
-            await mark_page_scraped(conn, resume_page)
+            await store.mark_page_scraped(resume_page)
             return resume_page
 
         # Check for matching tenders
-        for i in range(count):
-            relative_link = await tenders.nth(i).get_attribute("href", timeout=5000)
+        for link in links:
+            relative_link = link["href"]
             if relative_link:
                 full_link = f"{base_url}{relative_link}" if relative_link.startswith('/') else f"{base_url}/{relative_link}"
-                if known_tender and full_link == known_tender[0]:
+                if known_tender and full_link == known_tender:
                     print(f"Confirmed resume page {resume_page} (matched tender)")
                     return resume_page
 
@@ -144,166 +89,186 @@ async def find_resume_page(conn, base_url, page, log_file):
         print(f"Error verifying resume page {resume_page}: {e}")
         with open(log_file, 'a', encoding='utf-8') as f:
             f.write(f"Error verifying resume page {resume_page}: {e}\n")
-        await mark_page_scraped(conn, resume_page)
+        await store.mark_page_scraped(resume_page)
         return resume_page
 
-async def scrape_page(page, base_url, page_num, csv_file, log_file, conn, existing_urls, initial_phase=True):
-    """Scrape all tenders on a single page and save to CSV, stopping if too many duplicates in initial phase."""
+async def navigate(page, url, budget):
+    """Load `url` in `page` within the shared politeness budget."""
+    async with budget.request(url):
+        await page.goto(url, timeout=60000)
+        await page.wait_for_load_state('networkidle', timeout=40000)
+
+def filter_new_links(page_num, candidates, base_url, existing_urls, initial_phase):
+    """
+    (title, url) pairs for the listing links not scraped yet, or None once the initial phase hits
+    the duplicate limit.
+    """
     global duplicate_count
+    tender_links = []
+    for title, relative_link in candidates:
+        if relative_link:
+            full_link = f"{base_url}{relative_link}" if relative_link.startswith('/') else f"{base_url}/{relative_link}"
+            if full_link not in existing_urls:
+                tender_links.append((title, full_link))
+            else:
+                if initial_phase:
+                    duplicate_count += 1
+                    print(f"Page {page_num}: Skipping duplicate tender {title} ({full_link}), Duplicate count: {duplicate_count}")
+                    if duplicate_count >= DUPLICATE_LIMIT:
+                        print(f"Reached {DUPLICATE_LIMIT} duplicate links, stopping initial phase")
+                        return None
+                else:
+                    print(f"Page {page_num}: Skipping duplicate tender {title} ({full_link})")
+    return tender_links
+
+async def scrape_listing(page, budget, base_url, page_num, log_file, store, existing_urls, initial_phase=True):
+    """
+    Load one listing page and collect its new tender links, stopping if too many duplicates in initial phase.
+    Returns (ok, links): ok is the page's result for the stopping rules, links the (title, url) pairs still to
+    scrape, or None when the page needs no further work (failed, empty, already scraped or duplicate limit).
+    """
     try:
+        # Skip fully scraped pages in resume phase
+        if not initial_phase and await store.is_page_scraped(page_num):
+            print(f"Page {page_num}: Already fully scraped, skipping")
+            return True, None
+
         url = f"{base_url}/tenders?categories=&page={page_num}®ions=&sources="
         for attempt in range(3):
             try:
-                await page.goto(url, timeout=60000)
-                await page.wait_for_load_state('networkidle', timeout=40000)
+                await navigate(page, url, budget)
                 break
             except (PlaywrightTimeoutError, Exception) as e:
                 print(f"Page {page_num}: Attempt {attempt+1} failed to load page: {e}")
                 if attempt == 2:
                     with open(log_file, 'a', encoding='utf-8') as f:
                         f.write(f"Page {page_num}: Failed after 3 attempts: {e}\n")
-                    await mark_page_scraped(conn, page_num)
-                    return not initial_phase
+                    await store.mark_page_scraped(page_num)
+                    return not initial_phase, None
                 await asyncio.sleep(2 ** attempt)
 
         # Check if page has tenders
-        tenders = page.locator('h3 a')
-        count = await tenders.count()
-        if count == 0:
+        candidates = [(link["title"], link["href"]) for link in await evaluate_records(page, LISTING_LINKS)]
+        if not candidates:
             print(f"Page {page_num}: No tenders found")
             content = await page.content()
             with open(log_file, 'a', encoding='utf-8') as f:
                 f.write(f"Page {page_num}: No tenders, content:\n{content[:2000]}\n")
             await page.screenshot(path=f'page_{page_num}_debug.png')
-            await mark_page_scraped(conn, page_num)
-            return not initial_phase
+            await store.mark_page_scraped(page_num)
+            return not initial_phase, None
 
-        print(f"Page {page_num}: Found {count} tenders")
-
-        # Skip fully scraped pages in resume phase
-        if not initial_phase and await is_page_scraped(conn, page_num):
-            print(f"Page {page_num}: Already fully scraped, skipping")
-            return True
-
-        # Extract tender links
-        tender_links = []
-        for i in range(count):
-            try:
-                title = await tenders.nth(i).inner_text(timeout=5000)
-                relative_link = await tenders.nth(i).get_attribute("href", timeout=5000)
-                if relative_link:
-                    full_link = f"{base_url}{relative_link}" if relative_link.startswith('/') else f"{base_url}/{relative_link}"
-                    if full_link not in existing_urls:
-                        tender_links.append((title, full_link))
-                    else:
-                        if initial_phase:
-                            duplicate_count += 1
-                            print(f"Page {page_num}: Skipping duplicate tender {title} ({full_link}), Duplicate count: {duplicate_count}")
-                            if duplicate_count >= DUPLICATE_LIMIT:
-                                print(f"Reached {DUPLICATE_LIMIT} duplicate links, stopping initial phase")
-                                return False
-                        else:
-                            print(f"Page {page_num}: Skipping duplicate tender {title} ({full_link})")
-            except Exception as e:
-                print(f"Page {page_num}: Error collecting link for tender {i+1}: {e}")
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(f"Page {page_num}: Error collecting link for tender {i+1}: {e}\n")
-
-        # Scrape details for each tender
-        page_data = []
-        for title, full_link in tender_links:
-            print(f"Page {page_num}: Scraping {title} ({full_link})")
-            for attempt in range(3):
-                try:
-                    await page.goto(full_link, timeout=60000)
-                    await page.wait_for_load_state('networkidle', timeout=40000)
-
-                    # Scrape details
-                    tender_title = "Not found"
-                    title_locator = page.locator('h1.text-xl.font-semibold').first
-                    if await title_locator.count():
-                        tender_title = await title_locator.inner_text(timeout=10000)
-
-                    closing_date = "Not found"
-                    closing_date_locator = page.locator('div:has-text("Bid closing date") + div').first
-                    if await closing_date_locator.count():
-                        closing_date = await closing_date_locator.inner_text(timeout=5000)
-
-                    published_on = "Not found"
-                    published_on_locator = page.locator('div:has-text("Published on") + div').first
-                    if await published_on_locator.count():
-                        published_on_text = await published_on_locator.inner_text(timeout=5000)
-                        if '(' in published_on_text and ')' in published_on_text:
-                            published_on = published_on_text.split('(')[1].split(')')[0].strip()
-
-                    region = "Not found"
-                    region_locator = page.locator('div:has-text("Region") + div a').first
-                    if await region_locator.count():
-                        region = await region_locator.inner_text(timeout=5000)
-
-                    bidding_status = "Not found"
-                    bidding_status_locator = page.locator('div:has-text("Bidding") + div div.inline-flex').first
-                    if await bidding_status_locator.count():
-                        bidding_status = await bidding_status_locator.inner_text(timeout=5000)
-
-                    description_html = "Not found"
-                    description_truncated = "Not found"
-                    description_locator = page.locator("div.overflow-x-auto").first
-                    if await description_locator.count():
-                        description_html = await description_locator.inner_html(timeout=10000)
-                        description_truncated = description_html[:200] + "..."
-
-                    tor_download_link = "Not found"
-                    tor_download_locator = page.locator('a:has-text("Download")').first
-                    if await tor_download_locator.count():
-                        href = await tor_download_locator.get_attribute("href", timeout=5000)
-                        if href:
-                            tor_download_link = f"{base_url}{href}" if href.startswith('/') else href
-
-                    # Add timestamp for when the bid was scraped
-                    scrape_timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-
-                    print(f"Page {page_num}: Title: {tender_title}")
-                    print(f"Page {page_num}: Closing Date: {closing_date}")
-                    print(f"Page {page_num}: Published On: {published_on}")
-                    print(f"Page {page_num}: Region: {region}")
-                    print(f"Page {page_num}: Bidding Status: {bidding_status}")
-                    print(f"Page {page_num}: Description Snippet: {description_truncated}")
-                    print(f"Page {page_num}: TOR Download Link: {tor_download_link}")
-                    print(f"Page {page_num}: Scraped On: {scrape_timestamp}\n")
-
-                    page_data.append([tender_title, full_link, closing_date, published_on, region, bidding_status, description_html, tor_download_link, scrape_timestamp])
-                    await save_tender_to_db(conn, full_link, tender_title, scrape_timestamp, page_num)
-                    existing_urls.add(full_link)
-                    break
-                except (PlaywrightTimeoutError, Exception) as e:
-                    print(f"Page {page_num}: Attempt {attempt+1} failed for {full_link}: {e}")
-                    if attempt == 2:
-                        print(f"Page {page_num}: Skipping {full_link} after 3 failures")
-                        with open(log_file, 'a', encoding='utf-8') as f:
-                            f.write(f"Page {page_num}: Failed to scrape {full_link}: {e}\n")
-                        page_data.append([title, full_link, "Error", "Error", "Error", "Error", str(e), "Error", time.strftime("%Y-%m-%d %H:%M:%S")])
-                    await asyncio.sleep(2 ** attempt)
-
-            await asyncio.sleep(random.uniform(2, 3))
-
-        # Save to CSV
-        if page_data:
-            with open(csv_file, mode='a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerows(page_data)
-            print(f"Page {page_num}: Saved {len(page_data)} new tenders to {csv_file}")
-
-        # Mark page as scraped
-        await mark_page_scraped(conn, page_num)
-        return True
+        print(f"Page {page_num}: Found {len(candidates)} tenders")
+        tender_links = filter_new_links(page_num, candidates, base_url, existing_urls, initial_phase)
+        return (False, None) if tender_links is None else (True, tender_links)
 
     except Exception as e:
         print(f"Page {page_num}: Failed to process page: {e}")
         with open(log_file, 'a', encoding='utf-8') as f:
             f.write(f"Page {page_num}: Failed to process page: {e}\n")
-        await mark_page_scraped(conn, page_num)
-        return not initial_phase
+        await store.mark_page_scraped(page_num)
+        return not initial_phase, None
+
+async def scrape_listing_http(engine, page, budget, base_url, page_num, log_file, store, existing_urls, initial_phase=True):
+    """HTTP fast path for a listing page; the browser handles pages whose raw HTML has no tender links."""
+    if not initial_phase and await store.is_page_scraped(page_num):
+        print(f"Page {page_num}: Already fully scraped, skipping")
+        return True, None
+    candidates = []
+    url = f"{base_url}/tenders?categories=&page={page_num}®ions=&sources="
+    try:
+        candidates = parse_listing(await engine.fetch(url, budget))
+    except httpx.HTTPError as e:
+        print(f"Page {page_num}: HTTP fetch failed: {e}")
+    if not candidates:
+        # Empty, client-rendered or logged out: the browser path retries, logs and marks the page
+        engine.fallbacks += 1
+        return await scrape_listing(page, budget, base_url, page_num, log_file, store, existing_urls, initial_phase)
+    engine.fast += 1
+    print(f"Page {page_num}: Found {len(candidates)} tenders")
+    tender_links = filter_new_links(page_num, candidates, base_url, existing_urls, initial_phase)
+    return (False, None) if tender_links is None else (True, tender_links)
+
+async def scrape_tender(page, budget, base_url, page_num, title, full_link, store, existing_urls):
+    """Scrape one tender detail page into a CSV row; raises on failure so the scheduler can retry it."""
+    print(f"Page {page_num}: Scraping {title} ({full_link})")
+    await navigate(page, full_link, budget)
+    fields = await extract_tender_fields(page)
+    return await record_tender(page_num, full_link, fields, base_url, store, existing_urls)
+
+async def extract_tender_fields(page):
+    """Read the detail fields of the tender loaded in `page` (None for each one not found) in one round trip."""
+    return await evaluate_fields(page, TENDER_SCHEMA)
+
+async def scrape_tender_http(engine, page, budget, base_url, page_num, title, full_link, store, existing_urls):
+    """HTTP fast path for a tender; falls back to the browser when the fields aren't in the raw HTML."""
+    fields = None
+    try:
+        fields = parse_tender(await engine.fetch(full_link, budget))
+    except httpx.HTTPError as e:
+        print(f"Page {page_num}: HTTP fetch failed for {full_link}: {e}")
+    if fields is None:
+        engine.fallbacks += 1
+        return await scrape_tender(page, budget, base_url, page_num, title, full_link, store, existing_urls)
+    engine.fast += 1
+    print(f"Page {page_num}: Scraped {title} ({full_link}) over HTTP")
+    return await record_tender(page_num, full_link, fields, base_url, store, existing_urls)
+
+async def record_tender(page_num, full_link, fields, base_url, store, existing_urls):
+    """Turn extracted fields (None = not found) into the CSV row and record the tender in SQLite."""
+    tender_title = fields["title"] or "Not found"
+    closing_date = fields["closing_date"] or "Not found"
+
+    published_on = "Not found"
+    published_on_text = fields["published_on"]
+    if published_on_text and '(' in published_on_text and ')' in published_on_text:
+        published_on = published_on_text.split('(')[1].split(')')[0].strip()
+
+    region = fields["region"] or "Not found"
+    bidding_status = fields["bidding_status"] or "Not found"
+
+    description_html = "Not found"
+    description_truncated = "Not found"
+    if fields["description_html"] is not None:
+        description_html = fields["description_html"]
+        description_truncated = description_html[:200] + "..."
+
+    tor_download_link = "Not found"
+    href = fields["tor_href"]
+    if href:
+        tor_download_link = f"{base_url}{href}" if href.startswith('/') else href
+
+    # Add timestamp for when the bid was scraped
+    scrape_timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    print(f"Page {page_num}: Title: {tender_title}")
+    print(f"Page {page_num}: Closing Date: {closing_date}")
+    print(f"Page {page_num}: Published On: {published_on}")
+    print(f"Page {page_num}: Region: {region}")
+    print(f"Page {page_num}: Bidding Status: {bidding_status}")
+    print(f"Page {page_num}: Description Snippet: {description_truncated}")
+    print(f"Page {page_num}: TOR Download Link: {tor_download_link}")
+    print(f"Page {page_num}: Scraped On: {scrape_timestamp}\n")
+
+    await store.save_tender(full_link, tender_title, scrape_timestamp, page_num)
+    existing_urls.add(full_link)
+    return [tender_title, full_link, closing_date, published_on, region, bidding_status, description_html, tor_download_link, scrape_timestamp]
+
+def failed_tender(page_num, title, full_link, error, log_file):
+    """Error row for a tender that failed every attempt."""
+    print(f"Page {page_num}: Skipping {full_link} after 3 failures")
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(f"Page {page_num}: Failed to scrape {full_link}: {error}\n")
+    return [title, full_link, "Error", "Error", "Error", "Error", str(error), "Error", time.strftime("%Y-%m-%d %H:%M:%S")]
+
+async def finish_page(page_num, page_data, csv_file, store):
+    """Append a listing page's rows to the CSV and mark the page as scraped."""
+    if page_data:
+        with open(csv_file, mode='a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerows(page_data)
+        print(f"Page {page_num}: Saved {len(page_data)} new tenders to {csv_file}")
+    await store.mark_page_scraped(page_num)
 
 async def update_csv_schema(csv_file, log_file):
     """Update CSV schema to include Scrape Timestamp if needed."""
@@ -340,19 +305,52 @@ async def update_csv_schema(csv_file, log_file):
         with open(log_file, 'a', encoding='utf-8') as f:
             f.write(f"Error updating CSV {csv_file}: {e}\n")
 
+async def login(page, log_file):
+    """Log the browser context in through `page`; False after 3 failed attempts."""
+    for attempt in range(3):
+        try:
+            print(f"Attempting login (Attempt {attempt+1})")
+            await page.goto(f"{BASE_URL}/login", timeout=60000)
+            await page.wait_for_load_state('networkidle', timeout=40000)
+            email_locator = page.locator('#emailOrMobile')
+            await email_locator.wait_for(state='visible', timeout=30000)
+            await email_locator.fill(EMAIL)
+            await page.fill('input[name="password"]', PASSWORD)
+            login_button = page.locator('button:has-text("Login")')
+            await login_button.wait_for(state='visible', timeout=10000)
+            await login_button.click()
+            await page.wait_for_url("**/tenders", timeout=60000)
+            print("Login successful")
+            return True
+        except Exception as e:
+            print(f"Login attempt {attempt+1} failed: {e}")
+            try:
+                content = await page.content()
+                await page.screenshot(path=f'login_debug_attempt_{attempt+1}.png')
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(f"Login attempt {attempt+1} failed: {e}\nPage content:\n{content[:2000]}\n")
+            except:
+                print("Failed to log page content")
+            if attempt == 2:
+                print("Login failed after 3 attempts; exiting")
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(f"Login failed after 3 attempts: {e}\n")
+                return False
+            await asyncio.sleep(2 ** attempt)
+
 async def main():
     global duplicate_count
     base_url = BASE_URL
     csv_file = "../data/raw/tenders.csv"
     db_file = "../data/raw/tenders.db"
     log_file = "../data/raw/scrape_errors.log"
-    concurrent_pages = 4
+    concurrent_pages = SCRAPER_WORKERS
     pages_per_session = 10000
     max_pages = 35000
     max_empty_pages = 10
 
-    # Initialize database
-    conn = init_db(db_file)
+    # Open the bookkeeping database (WAL, group-committed by a background writer)
+    store = await StateStore(db_file, flush_interval=STATE_FLUSH_INTERVAL, flush_size=STATE_FLUSH_SIZE, queue_size=STATE_QUEUE_SIZE).open()
 
     # Update CSV schema
     await update_csv_schema(csv_file, log_file)
@@ -365,124 +363,108 @@ async def main():
             writer.writerow(["Title", "URL", "Closing Date", "Published On", "Region", "Bidding Status", "Description", "TOR Download Link", "Scrape Timestamp"])
 
     # Load existing URLs
-    existing_urls = await load_existing_urls(conn)
+    existing_urls = await store.load_existing_urls()
+    print(f"Loaded {len(existing_urls)} existing URLs from database")
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            user_agent=USER_AGENT,
             viewport={"width": 1280, "height": 720}
         )
 
         # Login
         page = await context.new_page()
-        # Login
-        page = await context.new_page()
-        for attempt in range(3):
-            try:
-                print(f"Attempting login (Attempt {attempt+1})")
-                await page.goto(f"{BASE_URL}/login", timeout=60000)
-                await page.wait_for_load_state('networkidle', timeout=40000)
-                email_locator = page.locator('#emailOrMobile')
-                await email_locator.wait_for(state='visible', timeout=30000)
-                await email_locator.fill(EMAIL)
-                await page.fill('input[name="password"]', PASSWORD)
-                login_button = page.locator('button:has-text("Login")')
-                await login_button.wait_for(state='visible', timeout=10000)
-                await login_button.click()
-                await page.wait_for_url("**/tenders", timeout=60000)
-                print("Login successful")
-                break
-            except Exception as e:
-                print(f"Login attempt {attempt+1} failed: {e}")
-                try:
-                    content = await page.content()
-                    await page.screenshot(path=f'login_debug_attempt_{attempt+1}.png')
-                    with open(log_file, 'a', encoding='utf-8') as f:
-                        f.write(f"Login attempt {attempt+1} failed: {e}\nPage content:\n{content[:2000]}\n")
-                except:
-                    print("Failed to log page content")
-                if attempt == 2:
-                    print("Login failed after 3 attempts; exiting")
-                    with open(log_file, 'a', encoding='utf-8') as f:
-                        f.write(f"Login failed after 3 attempts: {e}\n")
-                    await browser.close()
-                    conn.close()
-                    return
-                await asyncio.sleep(2 ** attempt)
+        if not await login(page, log_file):
+            await browser.close()
+            await store.close()
+            return
 
-        # Initial phase: Scrape from page 1 until 40 duplicates
+        # Long-lived worker pages shared by both phases; the login page stays free for find_resume_page
+        worker_pages = [await context.new_page() for _ in range(concurrent_pages)]
+        budget = PolitenessBudget(REQUESTS_PER_MINUTE, MAX_IN_FLIGHT, HostRateLimiter(HOST_MIN_INTERVAL, HOST_JITTER))
+        stats = Throughput()
+        reporter = asyncio.create_task(report_periodically(stats))
+
+        # HTTP engine: reuses the logged-in session's cookies; worker pages are only used as fallback
+        engine = None
+        if SCRAPER_ENGINE == "http":
+            engine = await HttpEngine.from_context(context, USER_AGENT, max_connections=MAX_IN_FLIGHT)
+
+        def fetch_listing(page, page_num, initial_phase):
+            if engine:
+                return scrape_listing_http(engine, page, budget, base_url, page_num, log_file, store, existing_urls, initial_phase=initial_phase)
+            return scrape_listing(page, budget, base_url, page_num, log_file, store, existing_urls, initial_phase=initial_phase)
+
+        def fetch_detail(page, page_num, title, url):
+            if engine:
+                return scrape_tender_http(engine, page, budget, base_url, page_num, title, url, store, existing_urls)
+            return scrape_tender(page, budget, base_url, page_num, title, url, store, existing_urls)
+
+        def make_scheduler(initial_phase):
+            return ScrapeScheduler(
+                worker_pages,
+                fetch_listing=lambda page, page_num: fetch_listing(page, page_num, initial_phase),
+                fetch_detail=fetch_detail,
+                finish_listing=lambda page_num, rows: finish_page(page_num, rows, csv_file, store),
+                failed_detail=lambda page_num, title, url, error: failed_tender(page_num, title, url, error, log_file),
+                detail_timeout=DETAIL_TIMEOUT,
+                stats=stats,
+            )
+
+        # Initial phase: Scrape from page 1 until 40 duplicates, or until a run of pages as long as the
+        # worker pool comes back empty
         duplicate_count = 0
-        page_num = 1
-        initial_phase = True
-        while page_num <= max_pages and duplicate_count < DUPLICATE_LIMIT:
-            tasks = []
-            batch_end = min(page_num + concurrent_pages - 1, max_pages)
-            for p in range(page_num, batch_end + 1):
-                page_task = await context.new_page()
-                task = asyncio.create_task(scrape_page(page_task, base_url, p, csv_file, log_file, conn, existing_urls, initial_phase=True))
-                tasks.append((task, page_task))
-
-            # Wait for batch
-            continue_scraping = False
-            for task, page_task in tasks:
-                result = await task
-                await page_task.close()
-                if result and duplicate_count < DUPLICATE_LIMIT:
-                    continue_scraping = True
-
-            if not continue_scraping:
+        failed_pages = 0
+
+        def continue_initial(page_num, ok):
+            nonlocal failed_pages
+            failed_pages = 0 if ok else failed_pages + 1
+            if duplicate_count >= DUPLICATE_LIMIT or failed_pages >= concurrent_pages:
                 print(f"Stopping initial phase at page {page_num}: No more tenders or reached duplicate limit")
-                break
+                return False
+            return True
 
-            page_num += concurrent_pages
-            await asyncio.sleep(random.uniform(3, 5))
+        await make_scheduler(initial_phase=True).run(range(1, max_pages + 1), continue_initial)
 
         # If stopped due to duplicates, find resume page and continue
         if duplicate_count >= DUPLICATE_LIMIT:
             print("Switching to resume phase")
-            resume_page = await find_resume_page(conn, base_url, page, log_file)
+            resume_page = await find_resume_page(store, base_url, page, log_file)
             print(f"Resuming scraping from page {resume_page}")
 
             # Resume phase: Scrape forward from resume_page
-            page_num = resume_page
-            pages_processed = 0
             empty_page_count = 0
-            while page_num <= max_pages and pages_processed < pages_per_session and empty_page_count < max_empty_pages:
-                tasks = []
-                batch_end = min(page_num + concurrent_pages - 1, max_pages)
-                for p in range(page_num, batch_end + 1):
-                    if pages_processed >= pages_per_session:
-                        break
-                    page_task = await context.new_page()
-                    task = asyncio.create_task(scrape_page(page_task, base_url, p, csv_file, log_file, conn, existing_urls, initial_phase=False))
-                    tasks.append((task, page_task))
-                    pages_processed += 1
-
-                # Wait OSIfor batch
-                continue_scraping = False
-                for task, page_task in tasks:
-                    result = await task
-                    await page_task.close()
-                    if result:
-                        continue_scraping = True
-                        empty_page_count = 0
-                    else:
-                        empty_page_count += 1
-                        print(f"Empty page count: {empty_page_count}/{max_empty_pages}")
-
+            last_page = resume_page - 1
+
+            def continue_resume(page_num, ok):
+                nonlocal empty_page_count, last_page
+                last_page = page_num
+                if ok:
+                    empty_page_count = 0
+                    return True
+                empty_page_count += 1
+                print(f"Empty page count: {empty_page_count}/{max_empty_pages}")
                 if empty_page_count >= max_empty_pages:
                     print(f"Stopping at page {page_num}: {max_empty_pages} consecutive empty pages")
-                    break
-
-                page_num += concurrent_pages
-                await asyncio.sleep(random.uniform(3, 5))
-
-            print(f"Session complete: Processed {pages_processed} pages, reached page {page_num - 1}")
-
+                    return False
+                return True
+
+            session_pages = range(resume_page, min(max_pages, resume_page + pages_per_session - 1) + 1)
+            await make_scheduler(initial_phase=False).run(session_pages, continue_resume)
+            print(f"Session complete: Processed {last_page - resume_page + 1} pages, reached page {last_page}")
+
+        reporter.cancel()
+        print(f"Throughput: {stats.summary()}")
+        if engine:
+            print(engine.summary())
+            await engine.aclose()
+        for worker_page in worker_pages:
+            await worker_page.close()
         await page.close()
         await browser.close()
-    conn.close()
+    await store.close()
+    print(f"State store: {store.rows_written} writes in {store.commits} commits")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+"""
+Work-queue scheduling for the scraper.
+
+A fixed pool of long-lived browser pages pulls jobs from one priority queue: listing pages, and the
+tender detail URLs each listing page produces. Detail jobs are served first, so a listing page that
+has started is finished before new ones are opened. At most `listings_ahead` listing pages are in
+progress at a time. No worker ever waits on another worker's slow page: failed tenders are retried
+through the queue rather than in place. Politeness is a shared PolitenessBudget (global rate and
+in-flight cap, plus HostRateLimiter spacing per host) instead of fixed sleeps.
+
+The scheduler knows nothing about Playwright. The fetch callbacks do the navigation, so the same
+code runs against simulated pages in bench_scheduler.py.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import random
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+DETAIL, LISTING = 0, 1  # queue priorities: lower is served first
+
+
+class HostRateLimiter:
+    """Spaces request starts to the same host by at least `min_interval` seconds (plus random jitter)."""
+
+    def __init__(self, min_interval, jitter=0.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot = {}
+
+    async def wait(self, url):
+        host = urlsplit(url).netloc
+        now = asyncio.get_running_loop().time()
+        # Reserve the next free slot for this host, then sleep until it comes up
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.min_interval + random.uniform(0, self.jitter)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class PolitenessBudget:
+    """
+    Request budget shared by every worker: at most `max_in_flight` page loads at once and
+    `per_minute` load starts per minute across all hosts (token bucket, bursts up to `burst`),
+    with each host further spaced by `host_limiter`.
+    """
+
+    def __init__(self, per_minute, max_in_flight, host_limiter, burst=None):
+        self.rate = per_minute / 60.0
+        self.burst = burst or max_in_flight
+        self.host_limiter = host_limiter
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._tokens = float(self.burst)
+        self._updated = None
+
+    async def _take_token(self):
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Going negative reserves a future token; the deficit is how long to wait for it
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    @contextlib.asynccontextmanager
+    async def request(self, url):
+        async with self._in_flight:
+            if self.rate > 0:
+                await self._take_token()
+            await self.host_limiter.wait(url)
+            yield
+
+
+class Throughput:
+    """Listing pages and tenders completed since `started`, reported per minute."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.pages = 0
+        self.tenders = 0
+        self.failed_jobs = 0
+        self.retries = 0
+
+    def summary(self):
+        minutes = max(time.monotonic() - self.started, 1e-9) / 60
+        return (f"{self.pages} pages ({self.pages / minutes:.1f}/min), "
+                f"{self.tenders} tenders ({self.tenders / minutes:.1f}/min), "
+                f"{self.retries} retries, {self.failed_jobs} failed jobs in {minutes:.1f} min")
+
+
+async def report_periodically(stats, interval=60):
+    while True:
+        await asyncio.sleep(interval)
+        print(f"Throughput: {stats.summary()}")
+
+
+class ScrapeScheduler:
+    """
+    Runs listing pages through a pool of pages (one worker per page).
+
+    fetch_listing(page, page_num) -> (ok, links): `ok` feeds the caller's stopping rule, and `links` is
+        the list of (title, url) pairs to scrape, or None when the listing page needs no more work.
+    fetch_detail(page, page_num, title, url) -> CSV row, or None to drop it. An exception, or
+        running past `detail_timeout` seconds, puts the job back on the queue after
+        retry_backoff * 2**attempt seconds. The worker moves on meanwhile. After `detail_attempts` tries,
+        failed_detail(page_num, title, url, error) supplies the row.
+    finish_listing(page_num, rows): called once every detail of the page is done. The rows are in
+        link order.
+    """
+
+    def __init__(self, pages, fetch_listing, fetch_detail, finish_listing, failed_detail=None,
+                 listings_ahead=None, detail_attempts=3, detail_timeout=None, retry_backoff=1.0, stats=None):
+        self.pages = pages
+        self.fetch_listing = fetch_listing
+        self.fetch_detail = fetch_detail
+        self.finish_listing = finish_listing
+        self.failed_detail = failed_detail
+        self.listings_ahead = listings_ahead or len(pages)
+        self.detail_attempts = detail_attempts
+        self.detail_timeout = detail_timeout
+        self.retry_backoff = retry_backoff
+        self.stats = stats or Throughput()
+
+    async def run(self, page_numbers, on_result):
+        """
+        Scrape `page_numbers` in order until they run out or on_result(page_num, ok) returns False.
+        on_result is called in page order even though pages complete out of order. Pages already in
+        progress when the run stops are still finished.
+        """
+        self._queue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._slots = asyncio.Semaphore(self.listings_ahead)
+        self._stop = asyncio.Event()
+        self._on_result = on_result
+        self._order = deque()
+        self._results = {}
+        self._details = {}  # page_num -> [details remaining, rows]
+
+        workers = [asyncio.create_task(self._worker(page)) for page in self.pages]
+        feeder = asyncio.create_task(self._feed(page_numbers))
+        try:
+            # Workers only return by raising; don't wait forever on the slots a dead worker held
+            await asyncio.wait([feeder, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for task in [feeder, *workers]:
+                if task.done():
+                    task.result()
+        finally:
+            for task in [feeder, *workers]:
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+        return self.stats
+
+    async def _feed(self, page_numbers):
+        for page_num in page_numbers:
+            await self._slots.acquire()
+            if self._stop.is_set():
+                self._slots.release()
+                break
+            self._order.append(page_num)
+            self._put(LISTING, (page_num,))
+        # Every slot back means every started listing page has been finished
+        for _ in range(self.listings_ahead):
+            await self._slots.acquire()
+
+    def _put(self, priority, job):
+        self._queue.put_nowait((priority, next(self._seq), job))
+
+    async def _worker(self, page):
+        while True:
+            priority, _, job = await self._queue.get()
+            if priority == LISTING:
+                await self._run_listing(page, *job)
+            else:
+                await self._run_detail(page, *job)
+
+    async def _run_listing(self, page, page_num):
+        if self._stop.is_set():
+            self._slots.release()
+            return
+        try:
+            ok, links = await self.fetch_listing(page, page_num)
+        except Exception as e:
+            print(f"Page {page_num}: Listing job failed: {e}")
+            self.stats.failed_jobs += 1
+            ok, links = False, None
+        self._record(page_num, ok)
+        if links is None:
+            self.stats.pages += 1
+            self._slots.release()
+        elif not links:
+            await self._finish(page_num, [])
+        else:
+            self._details[page_num] = [len(links), [None] * len(links)]
+            for index, (title, url) in enumerate(links):
+                self._put(DETAIL, (page_num, index, title, url, 0))
+
+    async def _run_detail(self, page, page_num, index, title, url, attempt):
+        try:
+            row = await asyncio.wait_for(self.fetch_detail(page, page_num, title, url), self.detail_timeout)
+        except Exception as e:
+            error = e if str(e) else type(e).__name__
+            print(f"Page {page_num}: Attempt {attempt+1} failed for {url}: {error}")
+            if attempt + 1 < self.detail_attempts:
+                self.stats.retries += 1
+                asyncio.get_running_loop().call_later(
+                    self.retry_backoff * 2 ** attempt, self._put, DETAIL, (page_num, index, title, url, attempt + 1))
+                return
+            self.stats.failed_jobs += 1
+            row = self.failed_detail(page_num, title, url, error) if self.failed_detail else None
+        state = self._details[page_num]
+        if row is not None:
+            state[1][index] = row
+            self.stats.tenders += 1
+        state[0] -= 1
+        if state[0] == 0:
+            del self._details[page_num]
+            await self._finish(page_num, [row for row in state[1] if row is not None])
+
+    async def _finish(self, page_num, rows):
+        try:
+            await self.finish_listing(page_num, rows)
+        except Exception as e:
+            print(f"Page {page_num}: Failed to save page: {e}")
+            self.stats.failed_jobs += 1
+        self.stats.pages += 1
+        self._slots.release()
+
+    def _record(self, page_num, ok):
+        self._results[page_num] = ok
+        while self._order and self._order[0] in self._results:
+            done = self._order.popleft()
+            ok = self._results.pop(done)
+            if not self._stop.is_set() and not self._on_result(done, ok):
+                self._stop.set()
@@ -0,0 +1,185 @@
+"""
+Scraper bookkeeping (the `tenders` and `pages` tables of tenders.db) without blocking the event loop.
+
+The database runs in WAL mode. Writes go through a bounded queue to a single writer task, which
+group-commits them on its own connection in a dedicated thread. A batch is committed once it
+reaches `flush_size` writes or is `flush_interval` seconds old. mark_page_scraped() and flush() are
+barriers: they return only after everything queued before them is committed with
+synchronous=FULL, so a page is never recorded as scraped before its tenders are on disk.
+Other batches commit with synchronous=NORMAL. A crash can lose at most the unflushed tenders of
+pages that were not marked yet, and those pages are scraped again.
+
+Reads run on a second connection in another thread. WAL lets them proceed while a batch is being
+written.
+"""
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tenders (
+        url TEXT PRIMARY KEY,
+        title TEXT,
+        scrape_timestamp TEXT,
+        page_num INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS pages (
+        page_num INTEGER PRIMARY KEY,
+        scraped_timestamp TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_tenders_page_num ON tenders (page_num);
+"""
+
+INSERT_TENDER = "INSERT OR IGNORE INTO tenders (url, title, scrape_timestamp, page_num) VALUES (?, ?, ?, ?)"
+MARK_PAGE = "INSERT OR REPLACE INTO pages (page_num, scraped_timestamp) VALUES (?, ?)"
+
+
+class StateStore:
+    def __init__(self, db_file, flush_interval=0.5, flush_size=200, queue_size=1000):
+        self.db_file = db_file
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.queue_size = queue_size
+        self.commits = 0
+        self.rows_written = 0
+        self._write_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-writer")
+        self._read_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-reader")
+        self._writer = None
+        self._unsynced = False
+
+    # ----- lifecycle -----
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._write_conn = await loop.run_in_executor(self._write_thread, self._connect, True)
+        self._read_conn = await loop.run_in_executor(self._read_thread, self._connect, False)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer = asyncio.create_task(self._write_loop())
+        return self
+
+    def _connect(self, writer):
+        # isolation_level=None: transactions are explicit, one BEGIN / COMMIT per batch
+        conn = sqlite3.connect(self.db_file, isolation_level=None)
+        if writer:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        return conn
+
+    async def close(self):
+        """Commit everything queued, stop the writer and close both connections."""
+        if self._writer is None:
+            return
+        await self.flush()
+        self._writer.cancel()
+        await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._write_thread, self._write_conn.close)
+        await loop.run_in_executor(self._read_thread, self._read_conn.close)
+        self._write_thread.shutdown()
+        self._read_thread.shutdown()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ----- writes -----
+
+    async def save_tender(self, url, title, timestamp, page_num):
+        """Queue a tender row; waits only when the queue is full."""
+        await self._queue.put((INSERT_TENDER, (url, title, timestamp, page_num)))
+
+    async def mark_page_scraped(self, page_num):
+        """Mark a page as fully scraped; returns once it and every earlier write are durable."""
+        await self._queue.put((MARK_PAGE, (page_num, time.strftime("%Y-%m-%d %H:%M:%S"))))
+        await self.flush()
+
+    async def flush(self):
+        """Wait until every write queued so far is committed durably."""
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((None, done))
+        await done
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, barriers = [], []
+            item = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            while True:
+                sql, arg = item
+                if sql is None:
+                    barriers.append(arg)
+                    break
+                batch.append(item)
+                if len(batch) >= self.flush_size:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await loop.run_in_executor(self._write_thread, self._commit, batch, bool(barriers))
+            except Exception as e:
+                print(f"State store: failed to commit {len(batch)} writes: {e}")
+                for done in barriers:
+                    done.set_exception(e)
+                continue
+            for done in barriers:
+                done.set_result(None)
+
+    def _commit(self, batch, durable):
+        conn = self._write_conn
+        if not batch:
+            if durable and self._unsynced:
+                # Nothing new to commit, but earlier NORMAL commits may not have reached the disk yet:
+                # a checkpoint syncs the WAL (and the database file)
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                self._unsynced = False
+            return
+        # In WAL mode a FULL commit syncs the whole WAL file, covering the earlier NORMAL commits too
+        conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        conn.execute("BEGIN")
+        try:
+            # Consecutive writes of the same statement go through one executemany
+            start = 0
+            for end in range(1, len(batch) + 1):
+                if end == len(batch) or batch[end][0] != batch[start][0]:
+                    conn.executemany(batch[start][0], [params for _, params in batch[start:end]])
+                    start = end
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._unsynced = not durable
+        self.commits += 1
+        self.rows_written += len(batch)
+
+    # ----- reads -----
+
+    async def _read(self, sql, params=()):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._read_thread, lambda: self._read_conn.execute(sql, params).fetchall())
+
+    async def load_existing_urls(self):
+        """Tender URLs already in the database."""
+        return {row[0] for row in await self._read("SELECT url FROM tenders")}
+
+    async def get_tender_count(self):
+        return (await self._read("SELECT COUNT(*) FROM tenders"))[0][0]
+
+    async def is_page_scraped(self, page_num):
+        return bool(await self._read("SELECT 1 FROM pages WHERE page_num = ?", (page_num,)))
+
+    async def get_last_scraped_page(self):
+        """Highest fully scraped page number, 0 if none."""
+        return (await self._read("SELECT MAX(page_num) FROM pages"))[0][0] or 0
+
+    async def first_tender_on_page(self, page_num):
+        """URL of one tender recorded for `page_num`, or None."""
+        rows = await self._read("SELECT url FROM tenders WHERE page_num = ? LIMIT 1", (page_num,))
+        return rows[0][0] if rows else None
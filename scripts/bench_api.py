@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Load test of the real API endpoints, with results saved as JSON for baseline comparison.
+Every scenario runs for BENCH_DURATION seconds at each BENCH_CONCURRENCY level; the report has
+throughput, p50 / p95 / p99 latency, error counts and the server-side DB time per request,
+taken from the difference of /metrics before and after the run.
+
+Point it at a server backed by gen_synthetic_tenders.py data for reproducible numbers:
+    BENCH_DATABASE_URL=... BENCH_ROWS=100000 python gen_synthetic_tenders.py
+    API_URL=http://localhost:8000 BENCH_OUTPUT=results.json python bench_api.py
+    API_URL=http://localhost:8000 BENCH_BASELINE=results.json python bench_api.py   # compare, exit 1 on regression
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import httpx
+
+# ----------------- CONFIG -----------------
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+DURATION = float(os.getenv("BENCH_DURATION", "15"))
+CONCURRENCY = [int(c) for c in os.getenv("BENCH_CONCURRENCY", "1,8,32").split(",")]
+SCENARIOS = os.getenv("BENCH_SCENARIOS", "")            # comma separated subset, empty = all
+USERNAME = os.getenv("BENCH_USERNAME", "bench_user_0")  # accounts created by gen_synthetic_tenders.py
+PASSWORD = os.getenv("BENCH_PASSWORD", "bench-password")
+BYPASS_CACHE = os.getenv("BENCH_BYPASS_CACHE", "0") == "1"  # add a random param so the response cache never hits
+OUTPUT = os.getenv("BENCH_OUTPUT", "bench_results.json")
+BASELINE = os.getenv("BENCH_BASELINE")
+REGRESSION_PCT = float(os.getenv("BENCH_REGRESSION_PCT", "10"))
+SEED = int(os.getenv("BENCH_SEED", "7"))
+# ------------------------------------------
+
+KEYWORDS = ["construction", "laptop", "medical", "road", "printing", "water supply", "vehicle", "cement", "consultancy"]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100.0 * len(values)))]
+
+
+class Workload:
+    """Request generators for each scenario; filter values come from the API itself."""
+
+    def __init__(self, rng, regions, sectors):
+        self.rng = rng
+        self.regions = regions
+        self.sectors = sectors
+
+    def filter_mix(self):
+        rng = self.rng
+        params = {"view": "list", "per_page": 20, "count": "cached", "sortOrder": "desc"}
+        if rng.random() < 0.5 and self.regions:
+            params["region"] = rng.choice(self.regions)
+        if rng.random() < 0.4 and self.sectors:
+            params["sector"] = rng.choice(self.sectors)
+        if rng.random() < 0.3:
+            params["keyword"] = rng.choice(KEYWORDS)
+        if rng.random() < 0.3:
+            params["status"] = "Open"
+        if rng.random() < 0.2:
+            year = rng.randint(2021, datetime.now().year)
+            params["publishedStart"], params["publishedEnd"] = f"{year}-01-01", f"{year}-06-30"
+        return params
+
+    async def tenders_filters(self, client):
+        return await client.get("/tenders", params=self.filter_mix())
+
+    async def tenders_deep_offset(self, client):
+        params = {"view": "list", "per_page": 20, "count": "none", "page": self.rng.randint(200, 2000)}
+        return await client.get("/tenders", params=params)
+
+    async def tenders_deep_cursor(self, client):
+        # Walk ten pages down a keyset chain; the latency recorded is for the whole walk
+        params = {"view": "list", "per_page": 20, "count": "none", "pagination": "cursor", "sortOrder": "desc"}
+        resp = None
+        for _ in range(10):
+            resp = await client.get("/tenders", params=params)
+            next_cursor = resp.json().get("next_cursor") if resp.status_code == 200 else None
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+        return resp
+
+    async def tenders_search(self, client):
+        return await client.get("/tenders/search", params=self.filter_mix())
+
+    async def trend_counts(self, client):
+        path = self.rng.choice(["/trends/regions/counts", "/trends/sectors/counts", "/trends/months/counts"])
+        return await client.get(path)
+
+    async def login(self, client):
+        return await client.post("/auth/login", json={"username_or_email": USERNAME, "password": PASSWORD})
+
+
+SCENARIO_ROUTES = {
+    # scenario -> routes whose /metrics DB time is attributed to it
+    "tenders_filters": ["/tenders"],
+    "tenders_deep_offset": ["/tenders"],
+    "tenders_deep_cursor": ["/tenders"],
+    "tenders_search": ["/tenders/search"],
+    "trend_counts": ["/trends/regions/counts", "/trends/sectors/counts", "/trends/months/counts"],
+    "login": ["/auth/login"],
+}
+
+_metric_line = re.compile(r'^(http_request_db_seconds_(?:sum|count))\{route="([^"]*)"\} ([0-9.eE+-]+)$')
+
+
+async def scrape_db_seconds(client):
+    """{route: (db seconds sum, sampled request count)} from the server's /metrics, or {} if unavailable."""
+    try:
+        resp = await client.get("/metrics")
+    except httpx.HTTPError:
+        return {}
+    if resp.status_code != 200:
+        return {}
+    totals = {}
+    for line in resp.text.splitlines():
+        match = _metric_line.match(line)
+        if match:
+            name, route, value = match.groups()
+            sums = totals.setdefault(route, [0.0, 0.0])
+            sums[0 if name.endswith("_sum") else 1] += float(value)
+    return totals
+
+
+def db_ms_per_request(before, after, routes):
+    seconds = sum(after.get(r, [0, 0])[0] - before.get(r, [0, 0])[0] for r in routes)
+    requests = sum(after.get(r, [0, 0])[1] - before.get(r, [0, 0])[1] for r in routes)
+    return round(seconds / requests * 1000, 2) if requests else None
+
+
+async def bust_cache(request):
+    if request.url.path != "/metrics":
+        request.url = request.url.copy_add_param("nocache", str(random.random()))
+
+
+async def run_scenario(name, workload, concurrency):
+    request = getattr(workload, name)
+    latencies, errors, statuses = [], 0, {}
+    limits = httpx.Limits(max_connections=concurrency)
+    hooks = {"request": [bust_cache]} if BYPASS_CACHE else {}
+    async with httpx.AsyncClient(base_url=API_URL, timeout=60, limits=limits, event_hooks=hooks) as client:
+
+        async def worker(deadline):
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    resp = await request(client)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+                if resp.status_code < 400:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        before = await scrape_db_seconds(client)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(start + DURATION) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        after = await scrape_db_seconds(client)
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "db_ms_per_request": db_ms_per_request(before, after, SCENARIO_ROUTES[name]),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print throughput / p95 deltas per scenario and concurrency; return the list of regressions."""
+    regressions = []
+    base_runs = {(name, run["concurrency"]): run for name, runs in baseline["scenarios"].items() for run in runs}
+    print(f"\n{'scenario':<22}{'conc':>6}{'rps':>12}{'Δrps':>9}{'p95 ms':>10}{'Δp95':>9}")
+    for name, runs in results["scenarios"].items():
+        for run in runs:
+            base = base_runs.get((name, run["concurrency"]))
+            if not base or not base["throughput_rps"] or not base["p95_ms"] or run["p95_ms"] is None:
+                continue
+            d_rps = (run["throughput_rps"] - base["throughput_rps"]) / base["throughput_rps"] * 100
+            d_p95 = (run["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+            flag = ""
+            if d_rps < -REGRESSION_PCT or d_p95 > REGRESSION_PCT:
+                flag = "  REGRESSION"
+                regressions.append((name, run["concurrency"]))
+            print(f"{name:<22}{run['concurrency']:>6}{run['throughput_rps']:>12}{d_rps:>+8.1f}%"
+                  f"{run['p95_ms']:>10}{d_p95:>+8.1f}%{flag}")
+    return regressions
+
+
+async def run():
+    rng = random.Random(SEED)
+    async with httpx.AsyncClient(base_url=API_URL, timeout=60) as client:
+        regions = (await client.get("/trends/regions")).json()
+        sectors = (await client.get("/trends/sectors")).json()
+        probe = (await client.get("/tenders", params={"per_page": 1, "count": "estimated"})).json()
+    workload = Workload(rng, regions, sectors)
+    selected = [s for s in SCENARIOS.split(",") if s] or list(SCENARIO_ROUTES)
+
+    results = {
+        "api_url": API_URL,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "corpus_rows_estimate": probe.get("total"),
+        "duration_s": DURATION,
+        "bypass_cache": BYPASS_CACHE,
+        "scenarios": {},
+    }
+    for name in selected:
+        results["scenarios"][name] = []
+        for concurrency in CONCURRENCY:
+            run_result = await run_scenario(name, workload, concurrency)
+            results["scenarios"][name].append(run_result)
+            print(f"{name:<22} c={concurrency:<4} {run_result['throughput_rps']:>9} rps  "
+                  f"p50 {run_result['p50_ms']} / p95 {run_result['p95_ms']} / p99 {run_result['p99_ms']} ms  "
+                  f"db {run_result['db_ms_per_request']} ms  errors {run_result['errors']}")
+
+    with open(OUTPUT, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {OUTPUT}")
+
+    if BASELINE:
+        with open(BASELINE) as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            print(f"\n{len(regressions)} run(s) regressed by more than {REGRESSION_PCT}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cold start of the API: time from process launch to the first successful response, first-request
+latency of each warmed route, and resident memory per worker, for each BENCH_WORKERS setting.
+Launches server/serve.py itself (needs DATABASE_URL / SECRET_KEY in the environment or server/.env),
+so run it on a free BENCH_PORT. Linux only (reads /proc for memory).
+
+Usage:
+    BENCH_WORKERS=1,4 python bench_cold_start.py
+    WARMUP_ON_START=0 BENCH_WORKERS=1,4 python bench_cold_start.py   # compare against no warm-up
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+
+import httpx
+
+# ----------------- CONFIG -----------------
+SERVER_DIR = Path(__file__).resolve().parent.parent / "server"
+WORKERS = [int(w) for w in os.getenv("BENCH_WORKERS", "1,4").split(",")]
+PORT = int(os.getenv("BENCH_PORT", "8099"))
+STARTUP_TIMEOUT = float(os.getenv("BENCH_STARTUP_TIMEOUT", "120"))
+PROBE_PATH = "/trends/regions"
+ROUTES = ["/trends/sectors", "/trends/regions/counts", "/trends/sectors/counts", "/trends/months/counts", "/public/months/counts"]
+# ------------------------------------------
+
+
+def rss_mb(pid):
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def child_pids(pid):
+    """Direct and indirect children of `pid` (uvicorn's supervisor spawns one process per worker)."""
+    parents = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        parents.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    found, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def measure(workers):
+    env = dict(os.environ, WEB_WORKERS=str(workers), PORT=str(PORT), LOG_LEVEL="warning")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "serve.py"], cwd=SERVER_DIR, env=env)
+    try:
+        first_response = None
+        with httpx.Client(base_url=f"http://127.0.0.1:{PORT}", timeout=10) as client:
+            while time.perf_counter() - start < STARTUP_TIMEOUT:
+                try:
+                    if client.get(PROBE_PATH).status_code == 200:
+                        first_response = time.perf_counter() - start
+                        break
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.05)
+            if first_response is None:
+                return {"workers": workers, "error": f"no response within {STARTUP_TIMEOUT}s"}
+
+            routes = {}
+            for path in ROUTES:
+                t0 = time.perf_counter()
+                resp = client.get(path)
+                routes[path] = {
+                    "ms": round((time.perf_counter() - t0) * 1000, 2),
+                    "status": resp.status_code,
+                    "cache": resp.headers.get("x-cache"),
+                }
+
+        # Let the remaining workers finish their own warm-up before sampling memory
+        time.sleep(2)
+        children = child_pids(proc.pid)
+        worker_rss = [rss_mb(pid) for pid in children if rss_mb(pid) is not None]
+        return {
+            "workers": workers,
+            "time_to_first_response_s": round(first_response, 2),
+            "first_requests": routes,
+            "supervisor_rss_mb": round(rss_mb(proc.pid) or 0, 1),
+            "worker_rss_mb": [round(r, 1) for r in worker_rss],
+            "total_rss_mb": round((rss_mb(proc.pid) or 0) + sum(worker_rss), 1),
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    results = [measure(workers) for workers in WORKERS]
+    print(json.dumps({"warmup_on_start": os.getenv("WARMUP_ON_START", "1") == "1", "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Mixed slow/fast load against a running API server.
+Fires slow keyword searches and fast lookups concurrently at the same worker and
+reports latency percentiles per request class, so runs before and after a server
+change can be compared (e.g. blocking handlers vs executor-backed handlers).
+
+Usage:
+    API_URL=http://localhost:8000 python bench_event_loop.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import random
+
+import httpx
+
+# ----------------- CONFIG -----------------
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+DURATION = float(os.getenv("BENCH_DURATION", "30"))        # seconds
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "16"))    # simultaneous clients
+SLOW_SHARE = float(os.getenv("BENCH_SLOW_SHARE", "0.2"))   # fraction of requests that are slow
+SLOW_REQUESTS = [
+    "/tenders?keyword=supply&per_page=20",
+    "/tenders?keyword=construction&per_page=20",
+    "/tenders?keyword=consultancy&per_page=20&sortBy=closing_date",
+]
+FAST_REQUESTS = [
+    "/trends/regions",
+    "/trends/sectors",
+    "/public/regions/counts",
+]
+# ------------------------------------------
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[k]
+
+
+def summarize(latencies):
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+async def client_loop(client, deadline, results, errors):
+    while time.perf_counter() < deadline:
+        kind = "slow" if random.random() < SLOW_SHARE else "fast"
+        path = random.choice(SLOW_REQUESTS if kind == "slow" else FAST_REQUESTS)
+        start = time.perf_counter()
+        try:
+            resp = await client.get(path)
+            resp.raise_for_status()
+            results[kind].append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+
+
+async def run():
+    results = {"slow": [], "fast": []}
+    errors = []
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    async with httpx.AsyncClient(base_url=API_URL, timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + DURATION
+        await asyncio.gather(*(client_loop(client, deadline, results, errors) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    report = {
+        "api_url": API_URL,
+        "duration_s": round(elapsed, 1),
+        "concurrency": CONCURRENCY,
+        "throughput_rps": round((len(results["slow"]) + len(results["fast"])) / elapsed, 1),
+        "slow": summarize(results["slow"]),
+        "fast": summarize(results["fast"]),
+        "errors": len(errors),
+    }
+    print(json.dumps(report, indent=2))
+    if errors:
+        print("First errors:", *errors[:5], sep="\n  ", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: rendering a 100-row /tenders response.
+Compares FastAPI's default path (jsonable_encoder + JSONResponse) with the server's
+orjson-based FastJSONResponse, and reports gzip / brotli sizes of the rendered body.
+Needs no database: rows are synthetic but shaped like RealDictCursor output.
+"""
+
+import sys
+import gzip
+import time
+import random
+import statistics
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from psycopg2.extras import RealDictRow
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "server"))
+from responses import FastJSONResponse  # noqa: E402
+
+ROWS = 100
+ITERATIONS = 500
+DESCRIPTION = "<p>Supply and delivery of office furniture, computers and accessories.</p>" * 30
+
+
+def make_rows():
+    rows = []
+    base = date(2024, 1, 1)
+    for i in range(ROWS):
+        row = RealDictRow()
+        row.update({
+            "id": i + 1,
+            "url": f"https://tender.2merkato.com/tenders/{i}",
+            "title": f"Tender {i} for procurement of goods",
+            "closing_date": base + timedelta(days=random.randint(0, 90)),
+            "published_on": base + timedelta(days=random.randint(0, 30)),
+            "created_at": base,
+            "region": random.choice(["Addis Ababa", "Oromia", "Amhara", "Sidama"]),
+            "status": "Open",
+            "description": DESCRIPTION,
+            "tor_url": None,
+            "language": "english",
+            "title_clean": f"tender {i} for procurement of goods",
+            "description_clean": DESCRIPTION.lower(),
+            "predicted_category": "Office Equipment and Furniture",
+            "year": Decimal("2024"),
+        })
+        rows.append(row)
+    return {"tenders": rows, "total": 12345, "total_kind": "exact", "has_more": True}
+
+
+def bench(render):
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        body = render()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6, body
+
+
+def main():
+    content = make_rows()
+    default_us, default_body = bench(lambda: JSONResponse(jsonable_encoder(content)).body)
+    fast_us, fast_body = bench(lambda: FastJSONResponse(content).body)
+
+    print(f"{ROWS}-row /tenders response, median of {ITERATIONS} renders")
+    print(f"  jsonable_encoder + JSONResponse: {default_us:9.1f} us  ({len(default_body)} bytes)")
+    print(f"  FastJSONResponse (orjson):       {fast_us:9.1f} us  ({len(fast_body)} bytes)")
+    print(f"  speedup: {default_us / fast_us:.1f}x")
+
+    print(f"  gzip (level 9):   {len(gzip.compress(fast_body)):>8} bytes")
+    try:
+        import brotli
+        print(f"  brotli (q4):      {len(brotli.compress(fast_body, quality=4)):>8} bytes")
+    except ImportError:
+        print("  brotli not installed, skipping")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Login throughput and its effect on concurrent read traffic.
+Runs LOGIN_CLIENTS clients hammering /auth/login next to READ_CLIENTS clients reading
+/trends/regions, then a read-only baseline, and compares read latency between the two.
+
+Usage:
+    API_URL=http://localhost:8000 BENCH_USERNAME=alice BENCH_PASSWORD=secret python bench_login.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+
+import httpx
+
+# ----------------- CONFIG -----------------
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+USERNAME = os.getenv("BENCH_USERNAME")
+PASSWORD = os.getenv("BENCH_PASSWORD")
+DURATION = float(os.getenv("BENCH_DURATION", "20"))
+LOGIN_CLIENTS = int(os.getenv("BENCH_LOGIN_CLIENTS", "16"))
+READ_CLIENTS = int(os.getenv("BENCH_READ_CLIENTS", "8"))
+READ_PATH = os.getenv("BENCH_READ_PATH", "/trends/regions")
+# ------------------------------------------
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100.0 * len(values)))]
+
+
+def summarize(latencies):
+    if not latencies:
+        return {"requests": 0}
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+async def login_loop(client, deadline, latencies, statuses):
+    body = {"username_or_email": USERNAME, "password": PASSWORD}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        resp = await client.post("/auth/login", json=body)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+        if resp.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        elif resp.status_code == 503:
+            await asyncio.sleep(float(resp.headers.get("Retry-After", "1")))
+
+
+async def read_loop(client, deadline, latencies):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        resp = await client.get(READ_PATH)
+        if resp.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+
+
+async def phase(with_logins):
+    login_latencies, read_latencies, statuses = [], [], {}
+    limits = httpx.Limits(max_connections=LOGIN_CLIENTS + READ_CLIENTS)
+    async with httpx.AsyncClient(base_url=API_URL, timeout=60, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + DURATION
+        tasks = [read_loop(client, deadline, read_latencies) for _ in range(READ_CLIENTS)]
+        if with_logins:
+            tasks += [login_loop(client, deadline, login_latencies, statuses) for _ in range(LOGIN_CLIENTS)]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    result = {"reads": summarize(read_latencies)}
+    if with_logins:
+        result["logins"] = summarize(login_latencies)
+        result["logins"]["per_second"] = round(len(login_latencies) / elapsed, 2)
+        result["login_statuses"] = statuses
+    return result
+
+
+async def run():
+    if not USERNAME or not PASSWORD:
+        print("ERROR: set BENCH_USERNAME and BENCH_PASSWORD to an existing account.")
+        sys.exit(1)
+    baseline = await phase(with_logins=False)
+    loaded = await phase(with_logins=True)
+    print(json.dumps({"read_only": baseline, "with_login_burst": loaded}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Payload size and serialization cost of a /tenders page: full rows vs the list projection.
+Fetches PAGE_SIZE rows with each column set from DATABASE_URL, then times fetch + JSON encoding.
+"""
+
+import os
+import sys
+import json
+import time
+import statistics
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+PAGE_SIZE = int(os.getenv("BENCH_PAGE_SIZE", "100"))
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "30"))
+
+FULL_COLUMNS = ("id, url, title, closing_date, published_on, created_at, region, status, description, "
+                "tor_url, language, title_clean, description_clean, predicted_category")
+LIST_COLUMNS = "id, url, title, published_on, closing_date, region, status, predicted_category"
+
+
+def measure(cursor, columns):
+    fetch_times, encode_times, size = [], [], 0
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        cursor.execute(f"SELECT {columns} FROM tenders ORDER BY published_on DESC, id DESC LIMIT %s", (PAGE_SIZE,))
+        rows = cursor.fetchall()
+        fetched = time.perf_counter()
+        body = json.dumps({"tenders": rows}, default=str).encode()
+        encoded = time.perf_counter()
+        fetch_times.append(fetched - start)
+        encode_times.append(encoded - fetched)
+        size = len(body)
+    return size, statistics.median(fetch_times) * 1000, statistics.median(encode_times) * 1000
+
+
+def main():
+    if not DATABASE_URL:
+        print("ERROR: DATABASE_URL not set. Export it first.")
+        sys.exit(1)
+    conn = psycopg2.connect(DATABASE_URL)
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    results = {name: measure(cursor, cols) for name, cols in (("full", FULL_COLUMNS), ("list", LIST_COLUMNS))}
+    cursor.close()
+    conn.close()
+
+    print(f"{PAGE_SIZE}-row page, median of {ITERATIONS} runs")
+    print(f"{'view':<6} {'bytes':>10} {'fetch':>10} {'encode':>10}")
+    for name, (size, fetch_ms, encode_ms) in results.items():
+        print(f"{name:<6} {size:>10} {fetch_ms:>8.2f}ms {encode_ms:>8.2f}ms")
+    full, slim = results["full"], results["list"]
+    if slim[0]:
+        print(f"\nlist view is {full[0] / slim[0]:.1f}x smaller, "
+              f"saves {full[1] - slim[1]:.2f}ms fetch + {full[2] - slim[2]:.2f}ms encode per page")
+
+
+if __name__ == "__main__":
+    main()
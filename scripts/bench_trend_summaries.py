@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Compare the live GROUP BY trend aggregates with the precomputed summary tables.
+Runs each query pair ITERATIONS times against DATABASE_URL and prints mean / p95 latency.
+Requires the summaries to exist (run ld_csv_to_db.py, or SELECT refresh_trend_summaries()).
+"""
+
+import os
+import sys
+import time
+import statistics
+
+import psycopg2
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "50"))
+
+QUERIES = {
+    "regions": (
+        "SELECT region, COUNT(*) FROM tenders WHERE region IS NOT NULL GROUP BY region",
+        "SELECT region, count FROM trend_region_counts WHERE count > 0",
+    ),
+    "sectors": (
+        "SELECT predicted_category, COUNT(*) FROM tenders WHERE predicted_category IS NOT NULL GROUP BY predicted_category",
+        "SELECT predicted_category, count FROM trend_sector_counts WHERE count > 0",
+    ),
+    "months": (
+        """SELECT EXTRACT(YEAR FROM published_on), EXTRACT(MONTH FROM published_on), COUNT(*)
+           FROM tenders WHERE published_on IS NOT NULL
+           GROUP BY EXTRACT(YEAR FROM published_on), EXTRACT(MONTH FROM published_on)""",
+        "SELECT year, month, count FROM trend_month_counts WHERE count > 0",
+    ),
+}
+
+
+def time_query(cursor, query):
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        cursor.execute(query)
+        cursor.fetchall()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.mean(timings) * 1000, timings[int(0.95 * (len(timings) - 1))] * 1000
+
+
+def main():
+    if not DATABASE_URL:
+        print("ERROR: DATABASE_URL not set. Export it first.")
+        sys.exit(1)
+    conn = psycopg2.connect(DATABASE_URL)
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM tenders")
+    print(f"tenders rows: {cursor.fetchone()[0]}, iterations: {ITERATIONS}\n")
+    print(f"{'aggregate':<10} {'live mean':>10} {'live p95':>10} {'summary mean':>13} {'summary p95':>12} {'speedup':>8}")
+    for name, (live, summary) in QUERIES.items():
+        live_mean, live_p95 = time_query(cursor, live)
+        summary_mean, summary_p95 = time_query(cursor, summary)
+        speedup = live_mean / summary_mean if summary_mean else float("inf")
+        print(f"{name:<10} {live_mean:>8.2f}ms {live_p95:>8.2f}ms {summary_mean:>11.2f}ms {summary_p95:>10.2f}ms {speedup:>7.1f}x")
+    cursor.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of the IVF vector index against an exact brute-force scan.
+Uses QUERIES vectors already in the index as queries (the /tenders/{id}/similar case) and,
+for each NPROBE value, reports recall@K and p50 / p95 search latency.
+
+Usage:
+    VECTOR_INDEX_DIR=../data/processed/vector_index python bench_vector_index.py
+"""
+
+import os
+import sys
+import json
+import time
+import statistics
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "server"))
+from vector_index import IVFIndex  # noqa: E402
+
+# ----------------- CONFIG -----------------
+INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "../data/processed/vector_index")
+QUERIES = int(os.getenv("BENCH_QUERIES", "200"))
+K = int(os.getenv("BENCH_K", "10"))
+NPROBES = [int(n) for n in os.getenv("BENCH_NPROBES", "1,4,8,16,32").split(",")]
+# ------------------------------------------
+
+
+def p95(values):
+    return sorted(values)[min(len(values) - 1, int(0.95 * len(values)))]
+
+
+def main():
+    if not (Path(INDEX_DIR) / "ids.npy").exists():
+        print("Index not found:", INDEX_DIR, "- run build_vector_index.py first")
+        sys.exit(1)
+    index = IVFIndex.load(INDEX_DIR)
+    rng = np.random.default_rng(0)
+    query_ids = [int(index.ids[i]) for i in rng.choice(len(index), size=min(QUERIES, len(index)), replace=False)]
+    queries = [(tender_id, index.vector_for_id(tender_id)) for tender_id in query_ids]
+
+    exact, exact_times = {}, []
+    for tender_id, vector in queries:
+        start = time.perf_counter()
+        exact[tender_id] = {i for i, _ in index.brute_force(vector, K, exclude_id=tender_id)}
+        exact_times.append(time.perf_counter() - start)
+
+    results = {
+        "vectors": len(index),
+        "lists": len(index.centroids),
+        "k": K,
+        "brute_force": {"p50_ms": round(statistics.median(exact_times) * 1000, 2), "p95_ms": round(p95(exact_times) * 1000, 2)},
+    }
+    for nprobe in NPROBES:
+        timings, recalls = [], []
+        for tender_id, vector in queries:
+            start = time.perf_counter()
+            found = index.search(vector, K, nprobe=nprobe, exclude_id=tender_id)
+            timings.append(time.perf_counter() - start)
+            expected = exact[tender_id]
+            recalls.append(len(expected & {i for i, _ in found}) / max(1, len(expected)))
+        results[f"nprobe={nprobe}"] = {
+            "recall": round(statistics.mean(recalls), 4),
+            "p50_ms": round(statistics.median(timings) * 1000, 2),
+            "p95_ms": round(p95(timings) * 1000, 2),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
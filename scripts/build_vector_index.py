@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Build the IVF vector index behind /tenders/{id}/similar and /search/semantic.
+Reads the title embeddings written by categorizing_tenders.py (memory-mapped, never fully
+loaded), maps each URL to its tender id in Postgres, and builds the index in a new sibling of
+INDEX_DIR, which is then switched to it atomically (INDEX_DIR becomes a symlink); a running API
+keeps serving the previous build until it reloads.
+Run after ld_csv_to_db.py so every embedded URL has an id; the API picks the new index up
+on restart (or POST /admin/vector-index/reload).
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+from pathlib import Path
+
+import numpy as np
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "server"))
+from vector_index import BLOCK_ROWS, IVFIndex, publish  # noqa: E402
+
+# ----------------- CONFIG -----------------
+CSV_DIR = Path('../data/processed')
+EMBEDDINGS_FILE = CSV_DIR / 'title_embeddings.f16'
+EMBEDDING_URLS_FILE = CSV_DIR / 'title_embeddings_urls.txt'
+EMBEDDINGS_META_FILE = CSV_DIR / 'title_embeddings.json'
+INDEX_DIR = Path(os.getenv("VECTOR_INDEX_DIR", str(CSV_DIR / 'vector_index')))
+NLIST = int(os.getenv("VECTOR_INDEX_NLIST", "0")) or None   # default: sqrt(n) lists
+ITERATIONS = int(os.getenv("VECTOR_INDEX_ITERATIONS", "20"))
+SAMPLE_SIZE = int(os.getenv("VECTOR_INDEX_SAMPLE_SIZE", "100000"))
+DATABASE_URL = os.getenv("DATABASE_URL")
+# ------------------------------------------
+
+
+def tender_ids_by_url():
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT url, id FROM tenders")
+            return dict(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+def matched_rows(embeddings, rows, path):
+    """The given rows of `embeddings`, copied block by block into a memmap at `path`."""
+    rows = np.asarray(rows)
+    subset = np.memmap(path, dtype=embeddings.dtype, mode="w+", shape=(len(rows), embeddings.shape[1]))
+    for start in range(0, len(rows), BLOCK_ROWS):
+        subset[start:start + BLOCK_ROWS] = embeddings[rows[start:start + BLOCK_ROWS]]
+    subset.flush()
+    return subset
+
+
+def main():
+    start = time.time()
+    if not EMBEDDINGS_FILE.exists():
+        print("Embeddings not found:", EMBEDDINGS_FILE, "- run categorizing_tenders.py first")
+        sys.exit(1)
+    meta = json.loads(EMBEDDINGS_META_FILE.read_text())
+    embeddings = np.memmap(EMBEDDINGS_FILE, dtype=np.float16, mode="r").reshape(-1, meta["dim"])
+    urls = EMBEDDING_URLS_FILE.read_text(encoding="utf-8").splitlines()
+    if len(urls) != len(embeddings):
+        print(f"Embedding/URL count mismatch: {len(embeddings)} vectors, {len(urls)} URLs")
+        sys.exit(1)
+
+    print("Mapping URLs to tender ids...")
+    id_map = tender_ids_by_url()
+    rows, ids, seen = [], [], set()
+    for row, url in enumerate(urls):
+        tender_id = id_map.get(url)
+        # URLs are unique in tenders; keep the first embedding if the CSV repeated one
+        if tender_id is not None and tender_id not in seen:
+            seen.add(tender_id)
+            rows.append(row)
+            ids.append(tender_id)
+    print(f"{len(ids)} of {len(urls)} embeddings matched a tender")
+    if not ids:
+        sys.exit(1)
+
+    build_dir = INDEX_DIR.with_name(f"{INDEX_DIR.name}.{time.strftime('%Y%m%d%H%M%S')}")
+    print("Building index in", build_dir)
+    build_dir.mkdir(parents=True)
+    subset_file = build_dir / "matched_embeddings.tmp"
+    try:
+        vectors = embeddings if len(rows) == len(embeddings) else matched_rows(embeddings, rows, subset_file)
+        index = IVFIndex.build(vectors, ids, build_dir, nlist=NLIST, iterations=ITERATIONS, sample_size=SAMPLE_SIZE)
+        subset_file.unlink(missing_ok=True)
+        (build_dir / "meta.json").write_text(json.dumps({**meta, "count": len(index), "nlist": len(index.centroids)}))
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    publish(build_dir, INDEX_DIR)
+    print(f"Indexed {len(index)} tenders into {len(index.centroids)} lists in {time.time() - start:.1f}s; {INDEX_DIR} -> {build_dir.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import pandas as pd
+import numpy as np
+import json
 import re
 from sentence_transformers import SentenceTransformer, util
 from tqdm.auto import tqdm
@@ -11,6 +13,12 @@ OUTPUT_CSV = "../data/processed/tenders_english_2merkato_categorized.csv"
 CHUNKSIZE = 50000
 SEMANTIC_THRESHOLD = 0.35
 MODEL_NAME = "all-mpnet-base-v2"
+# Title embeddings are kept for the similar-tenders / semantic search index (see build_vector_index.py):
+# raw float16 rows appended chunk by chunk, with the matching URLs one per line
+EMBEDDINGS_FILE = "../data/processed/title_embeddings.f16"
+EMBEDDING_URLS_FILE = "../data/processed/title_embeddings_urls.txt"
+EMBEDDINGS_META_FILE = "../data/processed/title_embeddings.json"
+ENCODE_BATCH_SIZE = 64
 
 # -----------------------------
 # Load embedding model
@@ -182,11 +190,14 @@ def keyword_forced_category(text, keyword_map, keyword_priority=None):
         return matches[0][0]
     return None
 
+def embedding_text(title: str) -> str:
+    """Text that gets embedded for a title: project portion, cleaned."""
+    return clean_text(extract_project_text(title))
+
 def categorize_row(title: str, model, category_embeddings, category_names,
-                   final_keyword_map, keyword_priority, semantic_threshold=0.35) -> str:
+                   final_keyword_map, keyword_priority, semantic_threshold=0.35, text_emb=None) -> str:
     """Categorize tender after boilerplate stripping and consultancy detection."""
-    project_text = extract_project_text(title)
-    cleaned_title = clean_text(project_text)
+    cleaned_title = embedding_text(title)
 
     is_consultancy = bool(CONSULTANCY_RE.search(cleaned_title))
 
@@ -195,8 +206,9 @@ def categorize_row(title: str, model, category_embeddings, category_names,
     if forced:
         return f"Consultancy - {forced}" if is_consultancy else forced
 
-    # 2. Semantic similarity fallback
-    text_emb = model.encode(cleaned_title, convert_to_tensor=True)
+    # 2. Semantic similarity fallback (reuses the chunk's batch embedding when given)
+    if text_emb is None:
+        text_emb = model.encode(cleaned_title, convert_to_tensor=True)
     sims = util.cos_sim(text_emb, category_embeddings).flatten()
     best_idx = int(sims.argmax())
     if sims[best_idx] < semantic_threshold:
@@ -216,18 +228,30 @@ category_embeddings = model.encode(category_texts, convert_to_tensor=True)
 # Process CSV in chunks
 # -----------------------------
 def process_chunk(df_chunk):
-    df_chunk["Predicted_Category"] = df_chunk["Title_clean"].apply(
-        lambda t: categorize_row(
+    # Embed every title of the chunk in batches once; used for categorization and persisted for search
+    texts = [embedding_text(t) for t in df_chunk["Title_clean"]]
+    embeddings = model.encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_tensor=True, normalize_embeddings=True)
+    df_chunk["Predicted_Category"] = [
+        categorize_row(
             t,
             model=model,
             category_embeddings=category_embeddings,
             category_names=category_names,
             final_keyword_map=FINAL_KEYWORD_MAP,
             keyword_priority=KEYWORD_PRIORITY,
-            semantic_threshold=SEMANTIC_THRESHOLD
+            semantic_threshold=SEMANTIC_THRESHOLD,
+            text_emb=emb,
         )
-    )
-    return df_chunk
+        for t, emb in zip(df_chunk["Title_clean"], embeddings)
+    ]
+    return df_chunk, embeddings.cpu().numpy()
+
+def save_embeddings(urls, embeddings, append):
+    mode = "a" if append else "w"
+    with open(EMBEDDINGS_FILE, mode + "b") as f:
+        f.write(np.ascontiguousarray(embeddings, dtype=np.float16).tobytes())
+    with open(EMBEDDING_URLS_FILE, mode, encoding="utf-8") as f:
+        f.writelines(f"{u}\n" for u in urls)
 
 def run_pipeline():
     reader = pd.read_csv(INPUT_CSV, chunksize=CHUNKSIZE)
@@ -241,7 +265,8 @@ def run_pipeline():
         chunk["Title_clean"] = chunk["Title"].apply(clean_text)
 
         # Process chunk to assign categories
-        chunk_result = process_chunk(chunk)
+        chunk_result, embeddings = process_chunk(chunk)
+        save_embeddings(chunk_result["URL"].astype(str).tolist(), embeddings, append=not first_chunk)
 
         # Keep only required columns
         output_chunk = chunk_result[["URL", "Title_clean", "Predicted_Category"]]
@@ -253,7 +278,11 @@ def run_pipeline():
         else:
             output_chunk.to_csv(OUTPUT_CSV, index=False, mode="a", header=False)
 
+    with open(EMBEDDINGS_META_FILE, "w") as f:
+        json.dump({"model": MODEL_NAME, "dim": model.get_sentence_embedding_dimension(), "dtype": "float16"}, f)
+
     print("\nCategorization complete. Saved to", OUTPUT_CSV)
+    print("Title embeddings saved to", EMBEDDINGS_FILE)
 
 if __name__ == "__main__":
     run_pipeline()
\ No newline at end of file
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Synthetic tenders / users corpus for benchmarking the API (see bench_api.py).
+Creates the same schema as ld_csv_to_db.py in BENCH_DATABASE_URL, streams BENCH_ROWS generated
+tenders in with COPY, adds BENCH_USERS accounts sharing one password, then records the load and
+refreshes the derived tables exactly like a real load.
+
+Distributions follow the scraped data: a few regions and sectors dominate (Zipf-like weights),
+publishing volume grows over the years and dips on weekends, ~15% of tenders are the
+"Consultancy - " variant of a sector and closing dates fall 1-8 weeks after publication.
+The generator is seeded, so a scale always produces the same corpus.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql://localhost/tenders_bench BENCH_ROWS=100000 python gen_synthetic_tenders.py
+"""
+
+import io
+import os
+import sys
+import csv
+import time
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from ld_csv_to_db import ensure_schema, record_load, refresh_trend_summaries, refresh_user_feeds
+
+# ----------------- CONFIG -----------------
+# Deliberately not DATABASE_URL: this script truncates tables and must never point at production by accident
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+ROWS = int(os.getenv("BENCH_ROWS", "100000"))          # 10k / 100k / 1M are the reference scales
+USERS = int(os.getenv("BENCH_USERS", "1000"))
+PASSWORD = os.getenv("BENCH_PASSWORD", "bench-password")
+YEARS = int(os.getenv("BENCH_YEARS", "6"))              # publication dates span this many years back from today
+BATCH_SIZE = 20000
+SEED = int(os.getenv("BENCH_SEED", "42"))
+# ------------------------------------------
+
+REGIONS = [
+    "Addis Ababa", "Oromia", "Amhara", "SNNPR", "Tigray", "Sidama", "Dire Dawa", "Somali",
+    "Afar", "Harari", "Benishangul-Gumuz", "South West Ethiopia", "Gambela",
+]
+SECTORS = [
+    "Construction and Real Estate", "IT and Infrastructure", "Office Equipment and Furniture",
+    "Vehicles and Automotive", "Pharmaceuticals and Medical Supplies", "Building Materials",
+    "Agriculture and Agro-Processing", "Energy and Utilities", "Printing and Publishing",
+    "Medical Equipment and Accessories", "Water and Sanitation", "Food and Beverage Services",
+    "Textiles and Apparel", "Industrial Equipment and Machinery", "Facilities Management",
+    "Education and Training", "Telecommunications", "Chemicals and Materials", "Training Services",
+    "Hospitality and Tourism", "Metal and Metal Working", "Digital Services", "Renewable Energy",
+    "Research and Development", "Social Services", "Wood and Wood Working", "Packaging and Labelling",
+    "Surveying and Geospatial", "Architecture and Design", "Oil, Gas and Petrochemicals",
+]
+SECTOR_ITEMS = {
+    "Construction and Real Estate": ["building construction", "road rehabilitation", "bridge works", "office renovation"],
+    "IT and Infrastructure": ["desktop computers", "laptops", "network switches", "server equipment", "cctv cameras"],
+    "Office Equipment and Furniture": ["office furniture", "office chairs", "filing cabinets", "photocopiers"],
+    "Vehicles and Automotive": ["pickup vehicles", "motorcycles", "vehicle spare parts", "tyres"],
+    "Pharmaceuticals and Medical Supplies": ["medicines", "medical consumables", "laboratory reagents"],
+    "Building Materials": ["cement", "reinforcement steel", "roofing sheets", "sanitary materials"],
+    "Agriculture and Agro-Processing": ["improved seeds", "fertilizer", "irrigation pumps", "veterinary drugs"],
+    "Energy and Utilities": ["generators", "transformers", "electrical materials", "power cables"],
+    "Printing and Publishing": ["printing services", "brochures", "annual report printing"],
+    "Medical Equipment and Accessories": ["ultrasound machine", "laboratory equipment", "hospital beds"],
+    "Water and Sanitation": ["water supply scheme", "borehole drilling", "water pipes", "latrine construction"],
+    "Food and Beverage Services": ["catering services", "food items", "school feeding supplies"],
+}
+GENERIC_ITEMS = ["equipment", "materials", "services", "supplies", "tools"]
+BUYERS = [
+    "Ministry of Health", "Ethiopian Roads Administration", "Addis Ababa University", "Commercial Bank of Ethiopia",
+    "Ethio Telecom", "Ethiopian Electric Utility", "Regional Health Bureau", "City Administration",
+    "Water Works Construction Enterprise", "Ethiopian Airlines", "Town Water Utility", "Zonal Education Office",
+]
+TEMPLATES = [
+    "Procurement of {item} for {buyer}",
+    "Supply and delivery of {item}",
+    "Invitation to bid for {item}",
+    "{buyer} invites bids for {item}",
+    "National open tender for {item}",
+]
+FIRST_NAMES = ["Abebe", "Almaz", "Bekele", "Hana", "Dawit", "Meron", "Samuel", "Tigist", "Yonas", "Selam"]
+COMPANY_SIZES = ["1-10", "11-50", "51-200", "201-500", "500+"]
+
+
+def zipf_weights(n, s=1.1):
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def publication_days(rng, today, years):
+    """Day offsets skewed toward recent years (volume grows ~40% a year)."""
+    total_days = years * 365
+    weights = [1.4 ** (year) for year in range(years)]
+    while True:
+        year = rng.choices(range(years), weights=weights)[0]
+        day = today - timedelta(days=total_days - year * 365 - rng.randrange(365))
+        # Weekends see about a fifth of weekday volume
+        if day.weekday() < 5 or rng.random() < 0.2:
+            yield day
+
+
+def generate_tenders(rng, rows, today):
+    region_weights = zipf_weights(len(REGIONS))
+    sector_weights = zipf_weights(len(SECTORS), s=0.9)
+    days = publication_days(rng, today, YEARS)
+    for n in range(rows):
+        sector = rng.choices(SECTORS, weights=sector_weights)[0]
+        consultancy = rng.random() < 0.15
+        category = f"Consultancy - {sector}" if consultancy else sector
+        region = rng.choices(REGIONS, weights=region_weights)[0] if rng.random() > 0.03 else None
+        item = rng.choice(SECTOR_ITEMS.get(sector, GENERIC_ITEMS))
+        buyer = rng.choice(BUYERS)
+        title = rng.choice(TEMPLATES).format(item=item, buyer=buyer)
+        if consultancy:
+            title = f"Consultancy service for {item} study"
+        published = next(days)
+        closing = published + timedelta(days=rng.randint(7, 56))
+        description = (
+            f"{buyer} invites eligible bidders for {item} in {region or 'various locations'}. "
+            f"Bid documents can be obtained from the procurement office. "
+            + " ".join(rng.choice(("bid", "security", "document", "delivery", "lot", "specification", "warranty",
+                                   "payment", "evaluation", "award", "contract", "site", "sample", "quantity"))
+                       for _ in range(rng.randint(20, 60)))
+        )
+        yield (
+            f"https://bench.example/tenders/{n}",
+            title,
+            closing,
+            published,
+            published,
+            region,
+            "Open" if closing >= today else "Closed",
+            description,
+            None,
+            "English",
+            title.lower(),
+            description.lower(),
+            category,
+        )
+
+
+def copy_batch(cursor, batch):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in batch:
+        writer.writerow(["" if value is None else value for value in row])
+    buf.seek(0)
+    cursor.copy_expert(
+        """COPY tenders (url, title, closing_date, published_on, created_at, region, status, description,
+                         tor_url, language, title_clean, description_clean, predicted_category)
+           FROM STDIN WITH (FORMAT csv, NULL '')""",
+        buf,
+    )
+
+
+def ensure_users(cursor):
+    # The users table is created by the API's deployment; this mirrors the columns the API reads and writes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            first_name TEXT,
+            last_name TEXT,
+            username TEXT UNIQUE NOT NULL,
+            company_name TEXT,
+            company_description TEXT,
+            sectors TEXT[],
+            region_focus TEXT[],
+            company_size TEXT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL
+        )
+    """)
+
+
+def generate_users(rng, count, password_hash):
+    region_weights = zipf_weights(len(REGIONS))
+    for n in range(count):
+        first = rng.choice(FIRST_NAMES)
+        sectors = rng.sample(SECTORS[:15], rng.randint(1, 3))
+        regions = rng.choices(REGIONS, weights=region_weights, k=rng.randint(0, 2))
+        yield (first, "Bench", f"bench_user_{n}", f"{first} Trading", "Synthetic benchmark account",
+               sectors, sorted(set(regions)), rng.choice(COMPANY_SIZES), f"bench_user_{n}@bench.example", password_hash)
+
+
+def hash_password(password):
+    # Same scheme as the API, so the generated accounts can log in
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["argon2"], deprecated="auto").hash(password)
+
+
+def main():
+    if not DATABASE_URL:
+        print("ERROR: BENCH_DATABASE_URL not set (a scratch database; its tenders/users tables are truncated).")
+        sys.exit(1)
+    start = time.time()
+    rng = random.Random(SEED)
+    today = date.today()
+
+    conn = psycopg2.connect(DATABASE_URL)
+    cursor = conn.cursor()
+    ensure_schema(cursor)
+    ensure_users(cursor)
+    cursor.execute("""
+        TRUNCATE tenders, tender_loads, users, user_feed_candidates, saved_searches, alert_matches,
+                 trend_region_counts, trend_sector_counts, trend_month_counts RESTART IDENTITY CASCADE
+    """)
+    cursor.execute("UPDATE user_feed_state SET last_tender_id = 0, refreshed_at = NULL")
+    cursor.execute("UPDATE trend_summary_state SET last_tender_id = 0, refreshed_at = NULL")
+    conn.commit()
+
+    load_started_at = datetime.now(timezone.utc)
+    batch = []
+    for n, row in enumerate(generate_tenders(rng, ROWS, today), 1):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            copy_batch(cursor, batch)
+            conn.commit()
+            batch = []
+            print(f"  {n}/{ROWS} tenders ({time.time() - start:.0f}s)")
+    if batch:
+        copy_batch(cursor, batch)
+    conn.commit()
+
+    password_hash = hash_password(PASSWORD)
+    execute_values(
+        cursor,
+        """INSERT INTO users (first_name, last_name, username, company_name, company_description,
+                              sectors, region_focus, company_size, email, password_hash) VALUES %s""",
+        list(generate_users(rng, USERS, password_hash)),
+        page_size=1000,
+    )
+    conn.commit()
+
+    # As with a first real load, the existing corpus never triggers alerts
+    cursor.execute("UPDATE alert_state SET last_tender_id = (SELECT COALESCE(MAX(id), 0) FROM tenders), matched_at = NULL")
+    refresh_trend_summaries(cursor)
+    refresh_user_feeds(cursor)
+    record_load(cursor, load_started_at, ROWS, 0)  # last: it bumps the API's data version
+    conn.commit()
+    conn.autocommit = True
+    cursor.execute("VACUUM ANALYZE tenders")
+    cursor.close()
+    conn.close()
+    print(f"Generated {ROWS} tenders and {USERS} users (password '{PASSWORD}') in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,10 @@ import csv
 import sqlite3
 import gc
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 import re
+import urllib.request
 
 import pandas as pd
 import psycopg2
@@ -29,6 +31,9 @@ SQLITE_BATCH = 1000                          # inserts into sqlite in batches
 SQLITE_IN_CLAUSE = 500                       # max items per "IN (...)" query to sqlite (<=999)
 # Load Postgres URL from env (falls back to your example)
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional: API to notify when a load finishes so it drops its caches (needs the server's ADMIN_TOKEN)
+API_URL = os.getenv("API_URL")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 LOG_FILE = Path("./load_progress.log")
 # ------------------------------------------
 
@@ -37,6 +42,9 @@ COLUMNS = ['URL', 'Title', 'Closing_Date', 'Published_On', 'created_at',
            'Region', 'status', 'description', 'tor_url', 'Language',
            'Title_clean', 'Description_clean', 'Predicted_Category']
 
+# Columns the API can sort /tenders by
+SORT_COLUMNS = ['published_on', 'created_at', 'closing_date', 'title']
+
 # Helpful header-matching utils (case-insensitive)
 def find_header(headers, keywords):
     """Return first header containing all keywords (list) or None."""
@@ -136,6 +144,279 @@ def clean_date_series(s: pd.Series) -> pd.Series:
     dt_series = pd.to_datetime(s, errors="coerce", dayfirst=True)
     return dt_series.apply(lambda x: x.date() if pd.notnull(x) else None)
 
+# ---------------- trend summaries ----------------
+TREND_SUMMARY_DDL = """
+    CREATE TABLE IF NOT EXISTS trend_region_counts (
+        region TEXT PRIMARY KEY,
+        count BIGINT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS trend_sector_counts (
+        predicted_category TEXT PRIMARY KEY,
+        count BIGINT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS trend_month_counts (
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        count BIGINT NOT NULL,
+        PRIMARY KEY (year, month)
+    );
+    CREATE TABLE IF NOT EXISTS trend_summary_state (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        last_tender_id INTEGER NOT NULL DEFAULT 0,
+        refreshed_at TIMESTAMPTZ
+    );
+    INSERT INTO trend_summary_state (id) VALUES (TRUE) ON CONFLICT DO NOTHING;
+
+    -- Folds tenders added since the last refresh into the summary tables. Tenders are insert-only
+    -- (ON CONFLICT DO NOTHING), so counting rows with id > last_tender_id keeps the totals exact.
+    CREATE OR REPLACE FUNCTION refresh_trend_summaries() RETURNS TIMESTAMPTZ AS $$
+    DECLARE
+        from_id INTEGER;
+        to_id INTEGER;
+    BEGIN
+        -- Row lock serializes concurrent refreshes (loader + API schedule)
+        SELECT last_tender_id INTO from_id FROM trend_summary_state FOR UPDATE;
+        SELECT COALESCE(MAX(id), 0) INTO to_id FROM tenders;
+        IF to_id > from_id THEN
+            INSERT INTO trend_region_counts AS t (region, count)
+                SELECT region, COUNT(*) FROM tenders
+                WHERE id > from_id AND id <= to_id AND region IS NOT NULL
+                GROUP BY region
+            ON CONFLICT (region) DO UPDATE SET count = t.count + EXCLUDED.count;
+
+            INSERT INTO trend_sector_counts AS t (predicted_category, count)
+                SELECT predicted_category, COUNT(*) FROM tenders
+                WHERE id > from_id AND id <= to_id AND predicted_category IS NOT NULL
+                GROUP BY predicted_category
+            ON CONFLICT (predicted_category) DO UPDATE SET count = t.count + EXCLUDED.count;
+
+            INSERT INTO trend_month_counts AS t (year, month, count)
+                SELECT EXTRACT(YEAR FROM published_on)::INTEGER, EXTRACT(MONTH FROM published_on)::INTEGER, COUNT(*)
+                FROM tenders
+                WHERE id > from_id AND id <= to_id AND published_on IS NOT NULL
+                GROUP BY 1, 2
+            ON CONFLICT (year, month) DO UPDATE SET count = t.count + EXCLUDED.count;
+        END IF;
+        UPDATE trend_summary_state SET last_tender_id = to_id, refreshed_at = now();
+        RETURN now();
+    END
+    $$ LANGUAGE plpgsql;
+"""
+
+def ensure_trend_summaries(pg_cursor):
+    """Create the trend summary tables and their incremental refresh function (idempotent)."""
+    pg_cursor.execute(TREND_SUMMARY_DDL)
+
+def refresh_trend_summaries(pg_cursor):
+    pg_cursor.execute("SELECT refresh_trend_summaries()")
+    refreshed_at = pg_cursor.fetchone()[0]
+    print(f"Trend summaries refreshed at {refreshed_at}")
+
+# ---------------- personalized feeds ----------------
+# Per-user candidate lists for /dashboard/feed: open tenders whose category is one of the user's
+# sectors (plain or "Consultancy - <sector>") and whose region is in region_focus (any region if empty).
+USER_FEED_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_tenders_category_region_closing
+        ON tenders (Predicted_Category, Region, Closing_Date);
+
+    CREATE TABLE IF NOT EXISTS user_feed_candidates (
+        username TEXT NOT NULL,
+        tender_id INTEGER NOT NULL REFERENCES tenders(id) ON DELETE CASCADE,
+        closing_date DATE NOT NULL,
+        score SMALLINT NOT NULL,
+        PRIMARY KEY (username, tender_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_user_feed_candidates_closing
+        ON user_feed_candidates (username, closing_date, score DESC);
+
+    CREATE TABLE IF NOT EXISTS user_feed_state (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        last_tender_id INTEGER NOT NULL DEFAULT 0,
+        refreshed_at TIMESTAMPTZ
+    );
+    INSERT INTO user_feed_state (id) VALUES (TRUE) ON CONFLICT DO NOTHING;
+
+    -- Score: 2 for an exact sector match, 1 for the consultancy variant. Region needs no term:
+    -- candidates are already restricted to region_focus.
+    DROP FUNCTION IF EXISTS user_feed_score(TEXT, TEXT[], TEXT[]);
+    CREATE OR REPLACE FUNCTION user_feed_score(category TEXT, sectors TEXT[]) RETURNS SMALLINT AS $$
+        SELECT (CASE WHEN category = ANY(sectors) THEN 2 ELSE 1 END)::SMALLINT
+    $$ LANGUAGE sql IMMUTABLE;
+
+    CREATE OR REPLACE FUNCTION user_feed_categories(sectors TEXT[]) RETURNS TEXT[] AS $$
+        SELECT coalesce(sectors, '{}') || ARRAY(SELECT 'Consultancy - ' || s FROM unnest(sectors) AS s)
+    $$ LANGUAGE sql IMMUTABLE;
+
+    -- Full rebuild for one user (registration, profile change); served by the composite tenders index
+    CREATE OR REPLACE FUNCTION refresh_user_feed(p_username TEXT) RETURNS INTEGER AS $$
+    DECLARE
+        inserted INTEGER;
+    BEGIN
+        DELETE FROM user_feed_candidates WHERE username = p_username;
+        INSERT INTO user_feed_candidates (username, tender_id, closing_date, score)
+            SELECT u.username, t.id, t.closing_date, user_feed_score(t.predicted_category, u.sectors)
+            FROM users u
+            JOIN tenders t ON t.predicted_category = ANY(user_feed_categories(u.sectors))
+            WHERE u.username = p_username
+              AND t.closing_date >= CURRENT_DATE
+              AND (coalesce(cardinality(u.region_focus), 0) = 0 OR t.region = ANY(u.region_focus));
+        GET DIAGNOSTICS inserted = ROW_COUNT;
+        RETURN inserted;
+    END
+    $$ LANGUAGE plpgsql;
+
+    -- Incremental refresh after a load: match only tenders added since the last run, drop closed ones
+    CREATE OR REPLACE FUNCTION refresh_user_feeds() RETURNS INTEGER AS $$
+    DECLARE
+        from_id INTEGER;
+        to_id INTEGER;
+        inserted INTEGER := 0;
+    BEGIN
+        SELECT last_tender_id INTO from_id FROM user_feed_state FOR UPDATE;
+        SELECT COALESCE(MAX(id), 0) INTO to_id FROM tenders;
+        IF to_id > from_id THEN
+            INSERT INTO user_feed_candidates (username, tender_id, closing_date, score)
+                SELECT u.username, t.id, t.closing_date, user_feed_score(t.predicted_category, u.sectors)
+                FROM tenders t
+                JOIN users u ON t.predicted_category = ANY(user_feed_categories(u.sectors))
+                WHERE t.id > from_id AND t.id <= to_id
+                  AND t.closing_date >= CURRENT_DATE
+                  AND (coalesce(cardinality(u.region_focus), 0) = 0 OR t.region = ANY(u.region_focus))
+            ON CONFLICT DO NOTHING;
+            GET DIAGNOSTICS inserted = ROW_COUNT;
+        END IF;
+        DELETE FROM user_feed_candidates WHERE closing_date < CURRENT_DATE;
+        UPDATE user_feed_state SET last_tender_id = to_id, refreshed_at = now();
+        RETURN inserted;
+    END
+    $$ LANGUAGE plpgsql;
+"""
+
+def ensure_user_feeds(pg_cursor):
+    """Create the feed candidate tables, the composite tenders index and the refresh functions (idempotent)."""
+    pg_cursor.execute(USER_FEED_DDL)
+
+def refresh_user_feeds(pg_cursor):
+    pg_cursor.execute("SELECT refresh_user_feeds()")
+    print(f"User feeds refreshed ({pg_cursor.fetchone()[0]} new candidates)")
+
+# ---------------- saved-search alerts ----------------
+# Saved searches are matched against new tenders by the API (server/alerts.py), which keeps its
+# position in alert_state. It starts at the current max id so existing tenders never alert.
+ALERTS_DDL = """
+    CREATE TABLE IF NOT EXISTS saved_searches (
+        id SERIAL PRIMARY KEY,
+        username TEXT NOT NULL,
+        name TEXT NOT NULL,
+        keyword TEXT,
+        sectors TEXT[] NOT NULL DEFAULT '{}',
+        regions TEXT[] NOT NULL DEFAULT '{}',
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS idx_saved_searches_username ON saved_searches (username);
+
+    CREATE TABLE IF NOT EXISTS alert_matches (
+        search_id INTEGER NOT NULL REFERENCES saved_searches(id) ON DELETE CASCADE,
+        tender_id INTEGER NOT NULL REFERENCES tenders(id) ON DELETE CASCADE,
+        matched_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (search_id, tender_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_alert_matches_recent ON alert_matches (search_id, matched_at DESC);
+
+    CREATE TABLE IF NOT EXISTS alert_state (
+        id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+        last_tender_id INTEGER NOT NULL DEFAULT 0,
+        matched_at TIMESTAMPTZ
+    );
+    INSERT INTO alert_state (id, last_tender_id)
+        SELECT TRUE, COALESCE(MAX(id), 0) FROM tenders
+    ON CONFLICT DO NOTHING;
+"""
+
+def ensure_alerts(pg_cursor):
+    """Create the saved search / alert match tables (idempotent)."""
+    pg_cursor.execute(ALERTS_DDL)
+
+# ---------------- load bookkeeping ----------------
+def record_load(pg_cursor, started_at, processed_rows, max_id_before):
+    """Insert a tender_loads row covering the ids added by this run (None when nothing new was inserted)."""
+    pg_cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tenders")
+    max_id_after = pg_cursor.fetchone()[0]
+    first_id, last_id = (max_id_before + 1, max_id_after) if max_id_after > max_id_before else (None, None)
+    pg_cursor.execute(
+        "INSERT INTO tender_loads (started_at, rows_processed, first_tender_id, last_tender_id) VALUES (%s, %s, %s, %s) RETURNING id",
+        (started_at, processed_rows, first_id, last_id)
+    )
+    load_id = pg_cursor.fetchone()[0]
+    print(f"Recorded load #{load_id} (new tender ids: {first_id}..{last_id})")
+    return load_id
+
+def notify_api(path, action):
+    """POST to an API admin hook; failures are reported but never fail the load."""
+    if not API_URL or not ADMIN_TOKEN:
+        return
+    request = urllib.request.Request(
+        f"{API_URL.rstrip('/')}{path}",
+        method="POST",
+        headers={"X-Admin-Token": ADMIN_TOKEN},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=60) as resp:
+            print(f"API {action} ({resp.status})")
+    except Exception as e:
+        print(f"Warning: API {action} failed: {e}")
+
+# ---------------- schema ----------------
+def ensure_schema(pg_cursor):
+    """Create the tenders table, its indexes and every derived table / function the API relies on (idempotent)."""
+    pg_cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tenders (
+            id SERIAL PRIMARY KEY,
+            URL TEXT UNIQUE,
+            Title TEXT,
+            Closing_Date DATE,
+            Published_On DATE,
+            created_at DATE,
+            Region TEXT,
+            status TEXT,
+            description TEXT,
+            tor_url TEXT,
+            Language TEXT,
+            Title_clean TEXT,
+            Description_clean TEXT,
+            Predicted_Category TEXT
+        )
+    """)
+    # Full-text search: a generated tsvector kept in sync by Postgres on every insert, plus its GIN index
+    pg_cursor.execute("""
+        ALTER TABLE tenders ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(Title_clean, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(Description_clean, '')), 'B')
+        ) STORED
+    """)
+    pg_cursor.execute("CREATE INDEX IF NOT EXISTS idx_tenders_search ON tenders USING GIN (search_vector)")
+    # (sort column, id) indexes back keyset pagination on /tenders for every sortable column
+    for col in SORT_COLUMNS:
+        pg_cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_tenders_{col}_id ON tenders ({col}, id)")
+    # Status is derived from Closing_Date by the API: "open in <region>" is a range scan on this index
+    # (the closing_date index above serves it without a region filter)
+    pg_cursor.execute("CREATE INDEX IF NOT EXISTS idx_tenders_region_closing ON tenders (Region, Closing_Date)")
+    # Each completed load is recorded here; the API uses the latest id as its data version to invalidate caches
+    pg_cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tender_loads (
+            id SERIAL PRIMARY KEY,
+            started_at TIMESTAMPTZ NOT NULL,
+            finished_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            rows_processed INTEGER NOT NULL,
+            first_tender_id INTEGER,
+            last_tender_id INTEGER
+        )
+    """)
+    ensure_trend_summaries(pg_cursor)
+    ensure_user_feeds(pg_cursor)
+    ensure_alerts(pg_cursor)
+
 # ---------------- main processing ----------------
 def main():
     start_time = time.time()
@@ -158,25 +439,11 @@ def main():
 
     # Recreate table
     print("Dropping and recreating tenders table (Postgres)...")
-    pg_cursor.execute("""
-        CREATE TABLE IF NOT EXISTS tenders (
-            id SERIAL PRIMARY KEY,
-            URL TEXT UNIQUE,
-            Title TEXT,
-            Closing_Date DATE,
-            Published_On DATE,
-            created_at DATE,
-            Region TEXT,
-            status TEXT,
-            description TEXT,
-            tor_url TEXT,
-            Language TEXT,
-            Title_clean TEXT,
-            Description_clean TEXT,
-            Predicted_Category TEXT
-        )
-    """)
+    ensure_schema(pg_cursor)
     pg_conn.commit()
+    pg_cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tenders")
+    max_id_before = pg_cursor.fetchone()[0]
+    load_started_at = datetime.now(timezone.utc)
 
     insert_query = """
         INSERT INTO tenders (URL, Title, Closing_Date, Published_On, created_at, Region, status, description, tor_url, Language, Title_clean, Description_clean, Predicted_Category)
@@ -274,6 +541,16 @@ def main():
         del chunk, rows, unique_urls, predicted_map, urls
         gc.collect()
 
+    # Derived tables first, the load record last and in the same commit: the new tender_loads row
+    # changes the API's data version, so responses cached under it must already see the summaries
+    refresh_trend_summaries(pg_cursor)
+    refresh_user_feeds(pg_cursor)
+    record_load(pg_cursor, load_started_at, processed_rows, max_id_before)
+    pg_conn.commit()
+
+    notify_api("/admin/caches/invalidate", "caches invalidated")
+    notify_api("/admin/alerts/match", "alerts matched")
+
     print("All chunks processed. Closing connections.")
     pg_cursor.close()
     pg_conn.close()
@@ -0,0 +1,144 @@
+"""
+Saved-search alert matching.
+
+Every saved search is compiled into one shared AlertMatcher, and each batch of newly loaded
+tenders runs through it in a single pass instead of one query per search.
+
+A saved search has up to three kinds of criteria, all of which must hold:
+    sectors   tender category is one of them (or its "Consultancy - " variant)
+    regions   tender region is one of them
+    keyword   every term prefixes some lexeme of the tender's search_vector
+
+Both sides are normalized by Postgres' 'english' configuration, as in /tenders?keyword=: the
+caller stems each keyword term and drops stopwords with to_tsvector (the same normalization
+to_tsquery applies to `term:*`), and tender lexemes come from search_vector. So "constructions"
+alerts on a tender mentioning "construction", exactly like the search does.
+
+The distinct terms of all searches live in one prefix trie that each lexeme of a tender is walked
+through once; a keyword search is a candidate when all of its terms were hit, and is then checked
+against its sector / region sets. Searches without keyword terms are found through an inverted
+index from sector / region value to search ids, counting satisfied criteria. Either way the cost
+per tender follows the postings it touches, not the number of saved searches.
+"""
+
+import re
+from collections import defaultdict
+
+WORD_RE = re.compile(r"[^\W_]+")
+CONSULTANCY_PREFIX = "Consultancy - "
+_END = None  # trie key marking the end of a term; never collides with a character
+
+
+def keyword_terms(keyword):
+    """Distinct lower-cased terms of a keyword string, tokenized like build_tsquery() (before stemming)."""
+    return sorted(set(WORD_RE.findall(keyword.lower()))) if keyword else []
+
+
+class TermTrie:
+    """Prefix trie over keyword terms; finds every term a word starts with in one walk."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, term, term_id):
+        node = self.root
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = term_id
+
+    def prefixes_of(self, word):
+        node = self.root
+        found = []
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                break
+            term_id = node.get(_END)
+            if term_id is not None:
+                found.append(term_id)
+        return found
+
+
+class AlertMatcher:
+    def __init__(self, searches):
+        """`searches`: rows with id, terms (normalized keyword lexemes), sectors and regions."""
+        # Keyword searches are driven by their terms and then checked against their sector / region
+        # sets; the rest are found through the sector / region postings alone.
+        self.term_count = {}
+        self.filters = {}
+        self.required = {}
+        by_sector = defaultdict(set)
+        by_region = defaultdict(set)
+        self.term_postings = []
+        self.trie = TermTrie()
+        term_ids = {}
+
+        for search in searches:
+            search_id = search["id"]
+            terms = sorted(set(search["terms"] or ()))
+            sectors = set(search["sectors"] or ())
+            sectors |= {CONSULTANCY_PREFIX + sector for sector in sectors}
+            regions = frozenset(search["regions"] or ())
+            if terms:
+                self.term_count[search_id] = len(terms)
+                self.filters[search_id] = (frozenset(sectors), regions)
+                for term in terms:
+                    term_id = term_ids.get(term)
+                    if term_id is None:
+                        term_id = term_ids[term] = len(self.term_postings)
+                        self.term_postings.append([])
+                        self.trie.add(term, term_id)
+                    self.term_postings[term_id].append(search_id)
+            elif sectors or regions:
+                self.required[search_id] = bool(sectors) + bool(regions)
+                for sector in sectors:
+                    by_sector[sector].add(search_id)
+                for region in regions:
+                    by_region[region].add(search_id)
+            # A search without any criterion would match every tender; those are rejected when saved.
+            # One whose keyword was only stopwords keeps just its sector / region criteria.
+
+        self.by_sector = {key: tuple(ids) for key, ids in by_sector.items()}
+        self.by_region = {key: tuple(ids) for key, ids in by_region.items()}
+
+    def __len__(self):
+        return len(self.term_count) + len(self.required)
+
+    def matching_terms(self, lexemes):
+        term_ids = set()
+        prefixes_of = self.trie.prefixes_of
+        for lexeme in lexemes:
+            term_ids.update(prefixes_of(lexeme))
+        return term_ids
+
+    def match(self, category, region, lexemes):
+        """Ids of the saved searches a tender (with its search_vector lexemes) satisfies."""
+        matched = []
+        if self.term_postings and lexemes:
+            hits = defaultdict(int)
+            for term_id in self.matching_terms(lexemes):
+                for search_id in self.term_postings[term_id]:
+                    hits[search_id] += 1
+            term_count, filters = self.term_count, self.filters
+            for search_id, count in hits.items():
+                if count == term_count[search_id]:
+                    sectors, regions = filters[search_id]
+                    if (not sectors or category in sectors) and (not regions or region in regions):
+                        matched.append(search_id)
+
+        hits = defaultdict(int)
+        for search_id in self.by_sector.get(category, ()):
+            hits[search_id] += 1
+        for search_id in self.by_region.get(region, ()):
+            hits[search_id] += 1
+        required = self.required
+        matched.extend(search_id for search_id, count in hits.items() if count == required[search_id])
+        return matched
+
+    def match_batch(self, tenders):
+        """(search_id, tender_id) pairs for tender rows with id, predicted_category, region and lexemes."""
+        pairs = []
+        for tender in tenders:
+            for search_id in self.match(tender["predicted_category"], tender["region"], tender["lexemes"]):
+                pairs.append((search_id, tender["id"]))
+        return pairs
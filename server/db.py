@@ -0,0 +1,186 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import RealDictCursor
+from dotenv import load_dotenv
+
+from metrics import InstrumentedConnection, record_acquire
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))            # seconds to wait for a free connection
+DB_POOL_HEALTHCHECK_AFTER = float(os.getenv("DB_POOL_HEALTHCHECK_AFTER", "30"))  # ping connections idle longer than this
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class DatabasePool:
+    """
+    Thread-safe wrapper around psycopg2's ThreadedConnectionPool.
+    - Blocks up to `timeout` seconds for a free connection instead of failing immediately.
+    - Pings connections that sat idle for a while and replaces broken ones.
+    - Keeps counters so operators can see how busy the pool is.
+    - Owns a bounded executor so async endpoints can run blocking queries off the event loop.
+    """
+
+    def __init__(self, dsn, min_size, max_size, timeout, healthcheck_after):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.healthcheck_after = healthcheck_after
+        self._pool = None
+        self._executor = None
+        self._slots = threading.Semaphore(max_size)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._replaced = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def open(self):
+        if self._pool is None:
+            self._pool = pg_pool.ThreadedConnectionPool(
+                self.min_size, self.max_size, self.dsn, connection_factory=InstrumentedConnection
+            )
+        if self._executor is None:
+            # More threads than connections would only queue on the pool semaphore
+            self._executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix="db")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+            self._last_used.clear()
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking DB function in the pool's executor and await its result."""
+        if self._executor is None:
+            self.open()
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context variables (request metrics) into the worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(context.run, fn, *args, **kwargs))
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.healthcheck_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        if self._pool is None:
+            self.open()
+        start = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        acquired = self._slots.acquire(timeout=self.timeout)
+        waited = time.monotonic() - start
+        with self._lock:
+            self._waiting -= 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            if not acquired:
+                self._timeouts += 1
+        if not acquired:
+            raise PoolTimeout(f"No database connection available after {self.timeout:.1f}s")
+
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                self._last_used.pop(id(conn), None)
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+                with self._lock:
+                    self._replaced += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        record_acquire(time.monotonic() - start)
+        return conn
+
+    def putconn(self, conn):
+        try:
+            if self._pool is not None:
+                self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn, close=conn.closed != 0)
+            else:
+                conn.close()
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def fetch_all(self, query, params=None, dict_rows=True):
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor if dict_rows else None) as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+
+    async def fetch_all_async(self, query, params=None, dict_rows=True):
+        return await self.run(self.fetch_all, query, params, dict_rows)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._pool._pool) if self._pool is not None else 0,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "replaced_connections": self._replaced,
+                "wait_seconds_total": round(self._wait_seconds, 4),
+                "wait_seconds_avg": round(self._wait_seconds / self._checkouts, 6) if self._checkouts else 0.0,
+                "wait_seconds_max": round(self._max_wait_seconds, 4),
+            }
+
+
+db_pool = DatabasePool(
+    DATABASE_URL,
+    min_size=DB_POOL_MIN_SIZE,
+    max_size=DB_POOL_MAX_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    healthcheck_after=DB_POOL_HEALTHCHECK_AFTER,
+)
@@ -1,47 +1,99 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from psycopg2 import sql
 import os
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from datetime import datetime, timedelta, timezone
-from pydantic import BaseModel, EmailStr, Field
+from datetime import date, datetime, timedelta, timezone
+from pydantic import BaseModel, EmailStr, Field, field_validator
+import re
 import json
+import asyncio
+import hashlib
+import hmac
+import threading
+import time
+import io
+import csv
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import format_datetime
+import base64
+import httpx
+import orjson
+from pathlib import Path
 from fastapi.security import OAuth2PasswordBearer
 
 load_dotenv()
 
-app = FastAPI()
+from db import db_pool, PoolTimeout
+from cache import TTLCache
+from responses import FastJSONResponse, dumps
+from metrics import MetricsMiddleware, register_stats, render_metrics
+from shared_cache import open_shared_cache
+from vector_index import IVFIndex
+from alerts import AlertMatcher, keyword_terms
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["https://tender-trend.vercel.app"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db_pool.open()
+    load_vector_index()
+    if WARMUP_ON_START:
+        await warm_up()
+    background = []
+    if TREND_REFRESH_INTERVAL > 0:
+        background.append(asyncio.create_task(refresh_trend_summaries_periodically()))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        password_pool.shutdown()
+        db_pool.close()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY environment variable not set")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
-# DB context
+# DB context: borrow a pooled connection for the duration of the block
 @contextmanager
 def get_db_connection():
-    conn = psycopg2.connect(os.getenv("DATABASE_URL"))
-    try:
+    with db_pool.connection() as conn:
         yield conn
-    finally:
-        conn.close()
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    return JSONResponse(status_code=503, content={"detail": "Database busy, please retry"}, headers={"Retry-After": "1"})
+
+# Operator endpoints are only enabled when ADMIN_TOKEN is set
+def require_admin(x_admin_token: str = Header(None)):
+    if not ADMIN_TOKEN or not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
 
 # Pydantic models
 class UserRegister(BaseModel):
@@ -60,12 +112,90 @@ class UserLogin(BaseModel):
     username_or_email: str
     password: str
 
+class UserProfileUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    company_name: Optional[str] = None
+    company_description: Optional[str] = None
+    sectors: Optional[List[str]] = None
+    region_focus: Optional[List[str]] = None
+    company_size: Optional[str] = None
+
+    # An explicit null clears the list; NULL arrays would break the feed and alert matching
+    @field_validator("sectors", "region_focus", mode="before")
+    @classmethod
+    def null_to_empty_list(cls, value):
+        return [] if value is None else value
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    keyword: Optional[str] = Field(None, max_length=200)
+    sectors: List[str] = []
+    regions: List[str] = []
+
 class Token(BaseModel):
     access_token: str
     token_type: str
 
 # Utility functions
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Argon2 cost parameters (memory in KiB); each one left unset keeps the argon2-cffi default
+ARGON2_SETTINGS = {
+    f"argon2__{setting}": int(os.environ[name])
+    for name, setting in (
+        ("ARGON2_TIME_COST", "time_cost"),
+        ("ARGON2_MEMORY_COST", "memory_cost"),
+        ("ARGON2_PARALLELISM", "parallelism"),
+    )
+    if os.getenv(name)
+}
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", "32"))  # hash/verify jobs in flight (running + queued)
+
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **ARGON2_SETTINGS)
+
+class PasswordWorkerPool:
+    """
+    Dedicated, size-limited executor for Argon2 work so login bursts cannot starve other routes.
+    Jobs beyond `queue_limit` in flight are rejected with a 503 instead of piling up.
+    """
+
+    def __init__(self, workers, queue_limit):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, fn, *args):
+        # Only touched from the event loop thread, so the counter needs no lock
+        if self._in_flight >= self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Authentication is busy, please retry", headers={"Retry-After": "1"})
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._in_flight -= 1
+            self.completed += 1
+            self.busy_seconds += time.perf_counter() - start
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_job_ms": round(self.busy_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+password_pool = PasswordWorkerPool(PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -79,8 +209,44 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Authenticated principals are cached by token subject so protected requests skip the users lookup.
+# The principal is a slim projection of the users row: never the password hash.
+USER_PRINCIPAL_COLUMNS = [
+    "username", "first_name", "last_name", "email", "company_name", "company_description",
+    "sectors", "region_focus", "company_size",
+]
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+user_cache = TTLCache(max_entries=int(os.getenv("USER_CACHE_SIZE", "10000")), ttl=USER_CACHE_TTL)
+_user_lookup_lock = threading.Lock()
+_user_lookup_stats = {"lookups": 0, "seconds": 0.0}
+
+def load_principal(username):
+    start = time.perf_counter()
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(USER_PRINCIPAL_COLUMNS)} FROM users WHERE username = %s", (username,)
+            )
+            principal = cursor.fetchone()
+    with _user_lookup_lock:
+        _user_lookup_stats["lookups"] += 1
+        _user_lookup_stats["seconds"] += time.perf_counter() - start
+    return dict(principal) if principal else None
+
+def invalidate_user(username):
+    user_cache.pop(username)
+
+def user_cache_stats():
+    stats = user_cache.stats()
+    with _user_lookup_lock:
+        lookups, seconds = _user_lookup_stats["lookups"], _user_lookup_stats["seconds"]
+    avg_lookup = seconds / lookups if lookups else 0.0
+    stats["avg_lookup_ms"] = round(avg_lookup * 1000, 3)
+    stats["estimated_seconds_saved"] = round(stats["hits"] * avg_lookup, 3)
+    return stats
+
 # Authentication dependency
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
@@ -93,20 +259,17 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-            db_user = cursor.fetchone()
-            if not db_user:
-                raise credentials_exception
-            return db_user
+    principal = user_cache.get(username)
+    if principal is None:
+        principal = await db_pool.run(load_principal, username)
+        if not principal:
+            raise credentials_exception
+        user_cache.set(username, principal)
+    return principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# Registration endpoint
-@app.post("/auth/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register(user: UserRegister):
-    hashed_pw = hash_password(user.password.strip())
+def insert_user(user: UserRegister, hashed_pw: str):
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
             try:
@@ -143,91 +306,442 @@ def register(user: UserRegister):
             except Exception as e:
                 conn.rollback()
                 raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    return new_user
+
+# Registration endpoint
+@app.post("/auth/register", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def register(user: UserRegister):
+    hashed_pw = await password_pool.run(hash_password, user.password.strip())
+    new_user = await db_pool.run(insert_user, user, hashed_pw)
+    await db_pool.run(rebuild_user_feed, new_user["username"])
 
     # Generate token with username as sub
     access_token = create_access_token({"sub": new_user["username"]})
     return {"access_token": access_token, "token_type": "bearer"}
 
-# Login endpoint
-@app.post("/auth/login", response_model=Token)
-def login(user: UserLogin):
+def find_login_user(username_or_email: str):
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
             cursor.execute(
-                "SELECT * FROM users WHERE email = %s OR username = %s",
-                (user.username_or_email, user.username_or_email)
+                "SELECT username, password_hash FROM users WHERE email = %s OR username = %s",
+                (username_or_email, username_or_email)
             )
-            db_user = cursor.fetchone()
-            if not db_user or not verify_password(user.password, db_user["password_hash"]):
-                raise HTTPException(status_code=401, detail="Invalid credentials")
-    
+            return cursor.fetchone()
+
+# Login endpoint
+@app.post("/auth/login", response_model=Token)
+async def login(user: UserLogin):
+    db_user = await db_pool.run(find_login_user, user.username_or_email)
+    if not db_user or not await password_pool.run(verify_password, user.password, db_user["password_hash"]):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
     access_token = create_access_token({"sub": db_user["username"]})
     return {"access_token": access_token, "token_type": "bearer"}
 
+# Trend aggregates are served from summary tables maintained by refresh_trend_summaries()
+# (created by scripts/ld_csv_to_db.py). The live GROUP BY is only used until the summaries exist.
+TREND_REFRESH_INTERVAL = float(os.getenv("TREND_REFRESH_INTERVAL", "900"))  # seconds, 0 disables the schedule
+
+LIVE_REGION_COUNTS = """
+    SELECT region, COUNT(*) AS count
+    FROM tenders
+    WHERE region IS NOT NULL {filters}
+    GROUP BY region
+"""
+LIVE_SECTOR_COUNTS = """
+    SELECT predicted_category, COUNT(*) AS count
+    FROM tenders
+    WHERE predicted_category IS NOT NULL {filters}
+    GROUP BY predicted_category
+"""
+LIVE_MONTH_COUNTS = """
+    SELECT 
+        EXTRACT(YEAR FROM published_on) AS year,
+        EXTRACT(MONTH FROM published_on) AS month,
+        COUNT(*) AS count
+    FROM tenders
+    WHERE published_on IS NOT NULL {filters}
+    GROUP BY EXTRACT(YEAR FROM published_on), EXTRACT(MONTH FROM published_on)
+"""
+SUMMARY_REGION_COUNTS = "SELECT region, count FROM trend_region_counts WHERE count > 0"
+SUMMARY_SECTOR_COUNTS = "SELECT predicted_category, count FROM trend_sector_counts WHERE count > 0"
+SUMMARY_MONTH_COUNTS = "SELECT year, month, count FROM trend_month_counts WHERE count > 0"
+
+def fetch_trend_rows(summary_query, live_query, status=None, open_within_days=None):
+    """
+    Return (rows, refreshed_at) from the summary tables, or from the live aggregate if they are not built yet.
+    A status / open_within_days filter always uses the live aggregate; open tenders are a small,
+    closing_date-indexed slice, so that stays cheap.
+    """
+    conditions, params = build_tender_filters(None, None, None, status, None, None, open_within_days)
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            if conditions:
+                cursor.execute(live_query.format(filters="AND " + " AND ".join(conditions)), params)
+                return cursor.fetchall(), datetime.now(timezone.utc)
+            try:
+                cursor.execute("SELECT refreshed_at FROM trend_summary_state")
+                state = cursor.fetchone()
+                if state and state["refreshed_at"] is not None:
+                    cursor.execute(summary_query)
+                    return cursor.fetchall(), state["refreshed_at"]
+            except psycopg2.errors.UndefinedTable:
+                conn.rollback()
+            cursor.execute(live_query.format(filters=""))
+            return cursor.fetchall(), datetime.now(timezone.utc)
+
+def trend_json(rows, refreshed_at):
+    return FastJSONResponse(rows, headers={"X-Data-Refreshed-At": refreshed_at.isoformat()})
+
+async def trend_response(summary_query, live_query, status=None, open_within_days=None):
+    rows, refreshed_at = await db_pool.run(fetch_trend_rows, summary_query, live_query, status, open_within_days)
+    return trend_json(rows, refreshed_at)
+
+def refresh_trend_summaries():
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT refresh_trend_summaries()")
+            refreshed_at = cursor.fetchone()[0]
+        conn.commit()
+    return refreshed_at
+
+def refresh_user_feeds():
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT refresh_user_feeds()")
+            inserted = cursor.fetchone()[0]
+        conn.commit()
+    return inserted
+
+async def refresh_trend_summaries_periodically():
+    # Picks up loads whose loader run could not refresh derived data itself; a no-op when nothing is new
+    while True:
+        await asyncio.sleep(TREND_REFRESH_INTERVAL)
+        for refresh in (refresh_trend_summaries, refresh_user_feeds, match_new_tenders):
+            try:
+                await db_pool.run(refresh)
+            except Exception as e:
+                print(f"{refresh.__name__} failed: {e}")
+
 # Add new public endpoints
 @app.get("/public/regions/counts")
 async def public_region_counts():
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("""
-                SELECT region, COUNT(*) AS count
-                FROM tenders
-                WHERE region IS NOT NULL
-                GROUP BY region
-                ORDER BY count DESC
-                LIMIT 10
-            """)
-            return cursor.fetchall()
+    return await trend_response(
+        SUMMARY_REGION_COUNTS + " ORDER BY count DESC LIMIT 10",
+        LIVE_REGION_COUNTS + " ORDER BY count DESC LIMIT 10",
+    )
 
 @app.get("/public/sectors/counts")
 async def public_sector_counts():
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("""
-                SELECT predicted_category, COUNT(*) AS count
-                FROM tenders
-                WHERE predicted_category IS NOT NULL
-                GROUP BY predicted_category
-                ORDER BY count DESC
-                LIMIT 10
-            """)
-            return cursor.fetchall()
+    return await trend_response(
+        SUMMARY_SECTOR_COUNTS + " ORDER BY count DESC LIMIT 10",
+        LIVE_SECTOR_COUNTS + " ORDER BY count DESC LIMIT 10",
+    )
 
 @app.get("/public/months/counts")
 async def public_month_counts():
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("""
-                SELECT 
-                    EXTRACT(YEAR FROM published_on) AS year,
-                    EXTRACT(MONTH FROM published_on) AS month,
-                    COUNT(*) AS count
-                FROM tenders
-                WHERE published_on IS NOT NULL
-                GROUP BY EXTRACT(YEAR FROM published_on), EXTRACT(MONTH FROM published_on)
-                ORDER BY year DESC, month DESC
-                LIMIT 10
-            """)
-            results = cursor.fetchall()
-            print("Raw month counts:", results)
-            return results
+    results, refreshed_at = await db_pool.run(
+        fetch_trend_rows,
+        SUMMARY_MONTH_COUNTS + " ORDER BY year DESC, month DESC LIMIT 10",
+        LIVE_MONTH_COUNTS + " ORDER BY year DESC, month DESC LIMIT 10",
+    )
+    return trend_json(results, refreshed_at)
 
 # Existing endpoints with transaction management
 @app.get("/trends/regions")
 async def get_regions():
-    with get_db_connection() as conn:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT DISTINCT region FROM tenders WHERE region IS NOT NULL")
-            regions = [row[0] for row in cursor.fetchall()]
-            return regions
+    rows = await db_pool.fetch_all_async("SELECT DISTINCT region FROM tenders WHERE region IS NOT NULL", dict_rows=False)
+    return FastJSONResponse([row[0] for row in rows])
 
 @app.get("/trends/sectors")
 async def get_sectors():
+    rows = await db_pool.fetch_all_async("SELECT DISTINCT predicted_category FROM tenders WHERE predicted_category IS NOT NULL", dict_rows=False)
+    return FastJSONResponse([row[0] for row in rows])
+
+TENDER_SORT_COLUMNS = {"published_on", "created_at", "closing_date", "title"}
+
+# Columns a client may request from /tenders (search_vector is internal and never returned)
+TENDER_COLUMNS = [
+    "id", "url", "title", "closing_date", "published_on", "created_at", "region", "status",
+    "description", "tor_url", "language", "title_clean", "description_clean", "predicted_category",
+]
+# view=list: what the listing table renders, without the heavy description text
+TENDER_LIST_COLUMNS = ["id", "url", "title", "published_on", "closing_date", "region", "status", "predicted_category"]
+
+# Status is derived from closing_date at query time: the scraped status string goes stale as soon as a
+# tender closes. Tenders without a closing date keep the scraped value.
+DERIVED_STATUS_SQL = (
+    "CASE WHEN {p}closing_date IS NULL THEN {p}status "
+    "WHEN {p}closing_date >= CURRENT_DATE THEN 'Open' ELSE 'Closed' END"
+)
+# status= filter values answered from closing_date (range scans on the closing_date index); other values
+# still match the scraped string
+STATUS_CONDITIONS = {
+    "open": "(closing_date >= CURRENT_DATE OR (closing_date IS NULL AND lower(status) = 'open'))",
+    "closed": "(closing_date < CURRENT_DATE OR (closing_date IS NULL AND lower(status) = 'closed'))",
+}
+
+def select_list(columns, alias=""):
+    """SQL select list for tender columns, with status computed from closing_date."""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(
+        f"{DERIVED_STATUS_SQL.format(p=prefix)} AS status" if column == "status" else prefix + column
+        for column in columns
+    )
+
+def tender_projection(view, fields, sort_by):
+    """Columns to select for /tenders; id and the sort column are always included for cursors."""
+    if fields:
+        columns = [f.strip().lower() for f in fields.split(",") if f.strip()]
+        unknown = [c for c in columns if c not in TENDER_COLUMNS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    elif view == "list":
+        columns = list(TENDER_LIST_COLUMNS)
+    else:
+        columns = list(TENDER_COLUMNS)
+    for required in ("id", sort_by):
+        if required in TENDER_COLUMNS and required not in columns:
+            columns.append(required)
+    return list(dict.fromkeys(columns))
+
+def build_tsquery(keyword):
+    """Turn free text into a prefix-matching tsquery, e.g. "road constr" -> "road:* & constr:*"."""
+    if not keyword:
+        return None
+    terms = re.findall(r"[^\W_]+", keyword.lower())
+    return " & ".join(f"{term}:*" for term in terms) or None
+
+def build_tender_filters(region, sector, keyword, status, publishedStart, publishedEnd,
+                         open_within_days=None, open_only=False):
+    conditions = []
+    params = []
+
+    if region:
+        conditions.append("region = %s")
+        params.append(region)
+    if sector:
+        conditions.append("predicted_category = %s")
+        params.append(sector)
+    tsquery = build_tsquery(keyword)
+    if tsquery:
+        # search_vector is a GIN-indexed tsvector over title_clean/description_clean maintained by the loader
+        conditions.append("search_vector @@ to_tsquery('english', %s)")
+        params.append(tsquery)
+    if status:
+        derived = STATUS_CONDITIONS.get(status.strip().lower())
+        if derived:
+            conditions.append(derived)
+        else:
+            conditions.append("status = %s")
+            params.append(status)
+    if open_within_days is not None:
+        if open_within_days < 0:
+            raise HTTPException(status_code=400, detail="open_within_days must be >= 0")
+        # "Open tenders closing this week": a bounded range on the closing_date index, closed history is never read
+        conditions.append("closing_date BETWEEN CURRENT_DATE AND CURRENT_DATE + %s")
+        params.append(open_within_days)
+    elif open_only:
+        conditions.append("closing_date >= CURRENT_DATE")
+    if publishedStart:
+        conditions.append("published_on >= %s")
+        params.append(publishedStart)
+    if publishedEnd:
+        conditions.append("published_on <= %s")
+        params.append(publishedEnd)
+
+    return conditions, params
+
+# Keyset cursors are opaque to clients: base64 of [sortBy, order, last sort value, last id]
+def encode_cursor(sort_by, order, value, row_id):
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    raw = json.dumps([sort_by, order, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+# Type of each sortable column's cursor value; dates travel as ISO strings
+CURSOR_VALUE_TYPES = {"published_on": "date", "created_at": "date", "closing_date": "date", "title": "text"}
+
+def decode_cursor(cursor, sort_by, order):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(row_id, bool) or not isinstance(row_id, int):
+            raise TypeError("cursor id must be an integer")
+        if value is not None:
+            if not isinstance(value, str):
+                raise TypeError("cursor value must be a string or null")
+            if CURSOR_VALUE_TYPES[sort_by] == "date":
+                value = date.fromisoformat(value)
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort_by or cursor_order != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match sortBy/sortOrder")
+    return value, row_id
+
+def keyset_condition(sort_by, order, value, row_id):
+    """
+    WHERE fragment that seeks past (value, row_id) under ORDER BY sort_by <order>, id <order>.
+    Postgres sorts NULLs last for ASC and first for DESC, so a (sort_by, id) index serves both directions.
+    """
+    if order == "ASC":
+        if value is None:
+            return f"({sort_by} IS NULL AND id > %s)", [row_id]
+        return f"(({sort_by}, id) > (%s, %s) OR {sort_by} IS NULL)", [value, row_id]
+    if value is None:
+        return f"({sort_by} IS NOT NULL OR id < %s)", [row_id]
+    return f"(({sort_by}, id) < (%s, %s))", [value, row_id]
+
+# Count strategies for /tenders totals:
+#   exact     - COUNT(*) with the page's filters (default)
+#   cached    - exact count memoized per normalized filter set until the next data load
+#   estimated - planner row estimate from EXPLAIN, no scan
+#   none      - skip the count; clients page on has_more
+COUNT_STRATEGIES = {"exact", "cached", "estimated", "none"}
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "600"))
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", "30"))
+
+count_cache = TTLCache(max_entries=int(os.getenv("COUNT_CACHE_SIZE", "2048")), ttl=COUNT_CACHE_TTL)
+_data_version_cache = TTLCache(max_entries=1, ttl=DATA_VERSION_TTL)
+
+def data_version(cursor=None):
+    """Id of the latest completed load in tender_loads; cached briefly so it costs one query per DATA_VERSION_TTL."""
+    version = _data_version_cache.get("version")
+    if version is not None:
+        return version
+    query = "SELECT COALESCE(MAX(id), 0) AS version FROM tender_loads"
+    try:
+        if cursor is not None:
+            cursor.execute(query)
+            version = cursor.fetchone()["version"]
+        else:
+            version = db_pool.fetch_all(query)[0]["version"]
+    except psycopg2.errors.UndefinedTable:
+        # Tables loaded before load tracking existed: treat as a single version
+        if cursor is not None:
+            cursor.connection.rollback()
+        version = 0
+    _data_version_cache.set("version", version)
+    return version
+
+def normalized_filter_key(region, sector, keyword, status, publishedStart, publishedEnd,
+                          open_within_days=None, open_only=False):
+    return (
+        (region or "").strip(),
+        (sector or "").strip(),
+        " ".join((keyword or "").lower().split()),
+        (status or "").strip(),
+        (publishedStart or "").strip(),
+        (publishedEnd or "").strip(),
+        open_within_days,
+        open_only,
+    )
+
+def count_tenders(cursor, strategy, where_clause, params, filter_key):
+    """Return (total, total_kind) for the filtered tender set using the requested strategy."""
+    where_sql = sql.SQL(where_clause) if where_clause else sql.SQL("")
+    if strategy == "none":
+        return None, "none"
+    if strategy == "estimated":
+        cursor.execute(sql.SQL("EXPLAIN (FORMAT JSON) SELECT 1 FROM tenders {}").format(where_sql), params)
+        plan = cursor.fetchone()["QUERY PLAN"]
+        return int(plan[0]["Plan"]["Plan Rows"]), "estimated"
+
+    cache_key = None
+    if strategy == "cached":
+        cache_key = (data_version(cursor), filter_key)
+        total = count_cache.get(cache_key)
+        if total is not None:
+            return total, "cached"
+
+    cursor.execute(sql.SQL("SELECT COUNT(*) AS count FROM tenders {}").format(where_sql), params)
+    total = cursor.fetchone()["count"]
+    if cache_key is not None:
+        count_cache.set(cache_key, total)
+    return total, "exact"
+
+def resolve_sort(sortBy, sortOrder, tsquery):
+    """Return (sort column, ASC/DESC, by_relevance); unknown columns fall back to published_on."""
+    if sortBy == "closing_soon":
+        # Open tenders by closing date, soonest first (callers also restrict to open ones)
+        return "closing_date", "ASC", False
+    by_relevance = sortBy == "relevance" and tsquery is not None
+    if not by_relevance and sortBy not in TENDER_SORT_COLUMNS:
+        sortBy = "published_on"
+    order = "DESC" if sortOrder.lower() == "desc" else "ASC"
+    return sortBy, order, by_relevance
+
+def query_tenders(region, sector, keyword, status, publishedStart, publishedEnd, sortBy, sortOrder, page, per_page,
+                  pagination="offset", page_cursor=None, count="exact", view="full", fields=None, open_within_days=None):
+    tsquery = build_tsquery(keyword)
+    open_only = sortBy == "closing_soon"
+    sortBy, order, by_relevance = resolve_sort(sortBy, sortOrder, tsquery)
+    if count not in COUNT_STRATEGIES:
+        count = "exact"
+    use_cursor = pagination == "cursor"
+    if use_cursor and by_relevance:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with sortBy=relevance")
+    projection = select_list(tender_projection(view, fields, sortBy))
+
+    conditions, params = build_tender_filters(
+        region, sector, keyword, status, publishedStart, publishedEnd, open_within_days, open_only
+    )
+    where_clause = " AND ".join(conditions)
+    if where_clause:
+        where_clause = "WHERE " + where_clause
+
+    page_conditions = list(conditions)
+    page_params = list(params)
+    if use_cursor and page_cursor:
+        # Seek past the last row of the previous page instead of skipping rows with OFFSET
+        last_value, last_id = decode_cursor(page_cursor, sortBy, order)
+        condition, condition_params = keyset_condition(sortBy, order, last_value, last_id)
+        page_conditions.append(condition)
+        page_params.extend(condition_params)
+    page_where = ("WHERE " + " AND ".join(page_conditions)) if page_conditions else ""
+
+    if by_relevance:
+        order_clause = "ORDER BY ts_rank_cd(search_vector, to_tsquery('english', %s)) DESC, id DESC"
+        page_params.append(tsquery)
+    else:
+        order_clause = f"ORDER BY {sortBy} {order}, id {order}"
+
+    # One extra row tells us whether another page exists without needing the total
+    page_params.append(per_page + 1)
+    limit_clause = "LIMIT %s"
+    if not use_cursor:
+        limit_clause += " OFFSET %s"
+        page_params.append((page - 1) * per_page)
+
     with get_db_connection() as conn:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT DISTINCT predicted_category FROM tenders WHERE predicted_category IS NOT NULL")
-            sectors = [row[0] for row in cursor.fetchall()]
-            return sectors
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            # Query for filtered tenders
+            query = sql.SQL(f"""
+                SELECT {projection} FROM tenders
+                {page_where}
+                {order_clause}
+                {limit_clause}
+            """)
+            try:
+                cursor.execute(query, page_params)
+            except psycopg2.DataError:
+                # Out-of-range values that passed decode_cursor (e.g. a year Postgres cannot store)
+                conn.rollback()
+                raise HTTPException(status_code=400, detail="Invalid cursor or filter value")
+            tenders = cursor.fetchall()
+            has_more = len(tenders) > per_page
+            tenders = tenders[:per_page]
+
+            filter_key = normalized_filter_key(
+                region, sector, keyword, status, publishedStart, publishedEnd, open_within_days, open_only
+            )
+            total, total_kind = count_tenders(cursor, count, where_clause, params, filter_key)
+
+    result = {"tenders": tenders, "total": total, "total_kind": total_kind, "has_more": has_more}
+    if use_cursor:
+        last = tenders[-1] if tenders else None
+        result["next_cursor"] = encode_cursor(sortBy, order, last[sortBy], last["id"]) if has_more else None
+    return result
 
 @app.get("/tenders")
 async def get_tenders(
@@ -240,105 +754,726 @@ async def get_tenders(
     sortBy: str = "published_on",
     sortOrder: str = "asc",
     page: int = 1,
-    per_page: int = 100
+    per_page: int = 100,
+    pagination: str = "offset",
+    cursor: str = None,
+    count: str = "exact",
+    view: str = "full",
+    fields: str = None,
+    open_within_days: int = None
 ):
-    valid_sort = {"published_on", "created_at", "closing_date", "title"}
-    if sortBy not in valid_sort:
-        sortBy = "published_on"
+    # pagination=cursor opts into keyset paging: pass back next_cursor to fetch the following page
+    # sortBy=relevance ranks keyword matches by full-text score
+    # view=list drops the description columns; fields=a,b,c selects exact columns (id is always included)
+    # count picks how "total" is computed (exact/cached/estimated/none); total_kind reports which one was used
+    # status=open|closed and open_within_days=N are computed from closing_date; sortBy=closing_soon lists open tenders soonest first
+    # Blocking psycopg2 work runs in the pool's executor so the event loop keeps serving other requests
+    result = await db_pool.run(
+        query_tenders, region, sector, keyword, status, publishedStart, publishedEnd, sortBy, sortOrder, page, per_page,
+        pagination=pagination, page_cursor=cursor, count=count,
+        view=view, fields=fields, open_within_days=open_within_days
+    )
+    return FastJSONResponse(result)
 
-    offset = (page - 1) * per_page
+# Faceted search: the page, the total and region / sector / status / month counts under the active
+# filters come back from a single statement. The facet counts are one GROUPING SETS aggregate over
+# one scan of the filtered rows; the page is its own index-ordered LIMIT query in the same statement.
+FACET_SETS = {7: "region", 11: "sector", 13: "status", 14: "month", 15: "total"}  # GROUPING() bitmask -> facet
 
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            conditions = []
-            params = []
-
-            if region:
-                conditions.append("region = %s")
-                params.append(region)
-            if sector:
-                conditions.append("predicted_category = %s")
-                params.append(sector)
-            if keyword:
-                conditions.append("(title ILIKE %s OR description ILIKE %s)")
-                params.extend([f"%{keyword}%", f"%{keyword}%"])
-            if status:
-                conditions.append("status = %s")
-                params.append(status)
-            if publishedStart:
-                conditions.append("published_on >= %s")
-                params.append(publishedStart)
-            if publishedEnd:
-                conditions.append("published_on <= %s")
-                params.append(publishedEnd)
-
-            where_clause = " AND ".join(conditions)
-            if where_clause:
-                where_clause = "WHERE " + where_clause
-
-            # Query for filtered count
-            count_query = sql.SQL("SELECT COUNT(*) AS count FROM tenders {}").format(
-                sql.SQL(where_clause) if where_clause else sql.SQL("")
-            )
-            cursor.execute(count_query, params)
-            total = cursor.fetchone()['count']
+def search_tenders(region, sector, keyword, status, publishedStart, publishedEnd, sortBy, sortOrder, page, per_page,
+                   view="list", fields=None, open_within_days=None):
+    tsquery = build_tsquery(keyword)
+    open_only = sortBy == "closing_soon"
+    sortBy, order, by_relevance = resolve_sort(sortBy, sortOrder, tsquery)
+    projection = select_list(tender_projection(view, fields, sortBy))
+    conditions, params = build_tender_filters(
+        region, sector, keyword, status, publishedStart, publishedEnd, open_within_days, open_only
+    )
+    where_clause = ("WHERE " + " AND ".join(conditions)) if conditions else ""
 
-            # Query for filtered tenders
-            query = sql.SQL(f"""
-                SELECT * FROM tenders
+    page_params = list(params)
+    if by_relevance:
+        order_clause = "ORDER BY ts_rank_cd(search_vector, to_tsquery('english', %s)) DESC, id DESC"
+        page_params.append(tsquery)
+    else:
+        order_clause = f"ORDER BY {sortBy} {order}, id {order}"
+    page_params.extend([per_page + 1, (page - 1) * per_page])
+
+    query = f"""
+        WITH page AS (
+            SELECT ROW_NUMBER() OVER () AS position, ordered.*
+            FROM (
+                SELECT {projection} FROM tenders
                 {where_clause}
-                ORDER BY {sortBy} {'DESC' if sortOrder.lower() == 'desc' else 'ASC'}
+                {order_clause}
                 LIMIT %s OFFSET %s
-            """)
-            params.extend([per_page, offset])
+            ) ordered
+        ),
+        facets AS (
+            SELECT GROUPING(region, predicted_category, status, month) AS grouping_id,
+                   COALESCE(region, predicted_category, status, month) AS value,
+                   COUNT(*) AS count
+            FROM (
+                SELECT region, predicted_category, {DERIVED_STATUS_SQL.format(p="")} AS status,
+                       to_char(published_on, 'YYYY-MM') AS month
+                FROM tenders
+                {where_clause}
+            ) filtered
+            GROUP BY GROUPING SETS ((region), (predicted_category), (status), (month), ())
+        )
+        SELECT
+            (SELECT COALESCE(json_agg(to_jsonb(page) - 'position' ORDER BY position), '[]'::json) FROM page) AS tenders,
+            (SELECT json_agg(json_build_object('set', grouping_id, 'value', value, 'count', count)) FROM facets) AS facets
+    """
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, page_params + params)
+            row = cursor.fetchone()
+
+    facets = {name: [] for name in ("region", "sector", "status", "month")}
+    total = 0
+    for facet in row["facets"] or ():
+        name = FACET_SETS.get(facet["set"])
+        if name == "total":
+            total = facet["count"]
+        elif name and facet["value"] is not None:
+            facets[name].append({"value": facet["value"], "count": facet["count"]})
+    for name, values in facets.items():
+        if name == "month":
+            values.sort(key=lambda v: v["value"], reverse=True)
+        else:
+            values.sort(key=lambda v: (-v["count"], v["value"]))
+
+    tenders = row["tenders"]
+    return {
+        "tenders": tenders[:per_page],
+        "total": total,
+        "has_more": len(tenders) > per_page,
+        "facets": facets,
+    }
+
+@app.get("/tenders/search")
+async def tenders_search(
+    region: str = None,
+    sector: str = None,
+    keyword: str = None,
+    status: str = None,
+    publishedStart: str = None,
+    publishedEnd: str = None,
+    sortBy: str = "published_on",
+    sortOrder: str = "desc",
+    page: int = 1,
+    per_page: int = 20,
+    view: str = "list",
+    fields: str = None,
+    open_within_days: int = None
+):
+    # Replaces /tenders + total + /trends/regions + /trends/sectors for the listing page: one round trip,
+    # and every facet count reflects the active filters
+    page = max(page, 1)
+    per_page = max(1, min(per_page, 100))
+    result = await db_pool.run(
+        search_tenders, region, sector, keyword, status, publishedStart, publishedEnd, sortBy, sortOrder,
+        page, per_page, view=view, fields=fields, open_within_days=open_within_days
+    )
+    return FastJSONResponse(result)
+
+# Bulk export: the same filters as /tenders, streamed from a server-side cursor in fixed-size batches
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain()."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _csv_batches(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+def _ndjson_batches(columns, batches):
+    for rows in batches:
+        yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+def _parquet_batches(columns, batches):
+    # One row group per batch; the footer is written when the writer closes
+    types = {"id": pa.int64(), "closing_date": pa.date32(), "published_on": pa.date32(), "created_at": pa.date32()}
+    schema = pa.schema([(c, types.get(c, pa.string())) for c in columns])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in batches:
+            arrays = [pa.array([row[i] for row in rows], type=schema.field(i).type) for i in range(len(columns))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+EXPORT_ENCODERS = {"csv": _csv_batches, "ndjson": _ndjson_batches, "parquet": _parquet_batches}
+
+def stream_tender_export(fmt, columns, query, params):
+    with get_db_connection() as conn:
+        # Named cursor = server-side cursor: Postgres holds the result and we pull EXPORT_BATCH_SIZE rows at a time
+        with conn.cursor(name=f"tender_export_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = EXPORT_BATCH_SIZE
             cursor.execute(query, params)
-            tenders = cursor.fetchall()
 
-    return {"tenders": tenders, "total": total}
+            def batches():
+                while True:
+                    rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                    if not rows:
+                        return
+                    yield rows
 
-@app.get("/trends/regions/counts")
-async def get_region_counts():
+            yield from EXPORT_ENCODERS[fmt](columns, batches())
+        conn.rollback()
+
+@app.get("/tenders/export")
+def export_tenders(
+    region: str = None,
+    sector: str = None,
+    keyword: str = None,
+    status: str = None,
+    publishedStart: str = None,
+    publishedEnd: str = None,
+    sortBy: str = "published_on",
+    sortOrder: str = "asc",
+    format: str = "csv",
+    view: str = "full",
+    fields: str = None,
+    open_within_days: int = None
+):
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    if format == "parquet" and pq is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    tsquery = build_tsquery(keyword)
+    open_only = sortBy == "closing_soon"
+    sortBy, order, by_relevance = resolve_sort(sortBy, sortOrder, tsquery)
+    columns = tender_projection(view, fields, sortBy)
+
+    conditions, params = build_tender_filters(
+        region, sector, keyword, status, publishedStart, publishedEnd, open_within_days, open_only
+    )
+    where_clause = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    if by_relevance:
+        order_clause = "ORDER BY ts_rank_cd(search_vector, to_tsquery('english', %s)) DESC, id DESC"
+        params.append(tsquery)
+    else:
+        order_clause = f"ORDER BY {sortBy} {order}, id {order}"
+    query = f"SELECT {select_list(columns)} FROM tenders {where_clause} {order_clause}"
+
+    # A sync generator: Starlette iterates it in a worker thread, so batches never block the event loop
+    return StreamingResponse(
+        stream_tender_export(format, columns, query, params),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tenders.{format}"'},
+    )
+
+def fetch_tender(tender_id):
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("""
-                SELECT region, COUNT(*) AS count
-                FROM tenders
-                WHERE region IS NOT NULL
-                GROUP BY region
-            """)
-            rows = cursor.fetchall()
-            return rows
+            cursor.execute(f"SELECT {select_list(TENDER_COLUMNS)} FROM tenders WHERE id = %s", (tender_id,))
+            return cursor.fetchone()
 
-@app.get("/trends/sectors/counts")
-async def get_sector_counts():
+# Detail view with the full description text
+@app.get("/tenders/{tender_id:int}")
+async def get_tender(tender_id: int):
+    tender = await db_pool.run(fetch_tender, tender_id)
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    return FastJSONResponse(tender)
+
+# Semantic similarity over title embeddings: an IVF index built offline by scripts/build_vector_index.py,
+# memory-mapped at startup. Query text is encoded with the same model as categorizing_tenders.py.
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "../data/processed/vector_index")
+VECTOR_NPROBE = int(os.getenv("VECTOR_NPROBE", "8"))  # inverted lists scanned per query (recall vs latency)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-mpnet-base-v2")
+SIMILAR_MAX_K = 50
+
+vector_state = {"index": None, "model": None}
+_embedding_model_lock = threading.Lock()
+
+def load_vector_index():
+    index_dir = Path(VECTOR_INDEX_DIR)
+    vector_state["index"] = IVFIndex.load(index_dir) if (index_dir / "ids.npy").exists() else None
+    return vector_state["index"]
+
+def require_vector_index():
+    index = vector_state["index"]
+    if index is None:
+        raise HTTPException(status_code=503, detail="Vector index not built; run scripts/build_vector_index.py")
+    return index
+
+def encode_query(text):
+    if SentenceTransformer is None:
+        raise HTTPException(status_code=501, detail="Semantic search requires sentence-transformers on the server")
+    # Loaded on first use so servers that never see a text query don't pay for the model
+    with _embedding_model_lock:
+        if vector_state["model"] is None:
+            vector_state["model"] = SentenceTransformer(EMBEDDING_MODEL)
+    return vector_state["model"].encode(text, normalize_embeddings=True)
+
+def fetch_scored_tenders(matches):
+    """Tender list rows for (id, similarity) matches, in match order."""
+    if not matches:
+        return []
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("""
-                SELECT predicted_category, COUNT(*) AS count
-                FROM tenders
-                WHERE predicted_category IS NOT NULL
-                GROUP BY predicted_category
-            """)
-            rows = cursor.fetchall()
-            return rows
+            cursor.execute(
+                f"SELECT {select_list(TENDER_LIST_COLUMNS)} FROM tenders WHERE id = ANY(%s)",
+                ([tender_id for tender_id, _ in matches],),
+            )
+            rows = {row["id"]: row for row in cursor.fetchall()}
+    return [{**rows[tender_id], "similarity": round(score, 4)} for tender_id, score in matches if tender_id in rows]
+
+@app.get("/tenders/{tender_id:int}/similar")
+async def similar_tenders(tender_id: int, k: int = 10):
+    index = require_vector_index()
+    vector = index.vector_for_id(tender_id)
+    if vector is None:
+        raise HTTPException(status_code=404, detail="Tender not in the vector index")
+    k = max(1, min(k, SIMILAR_MAX_K))
+    matches = await asyncio.to_thread(index.search, vector, k, VECTOR_NPROBE, tender_id)
+    return FastJSONResponse({"tenders": await db_pool.run(fetch_scored_tenders, matches)})
+
+@app.get("/search/semantic")
+async def semantic_search(q: str, k: int = 10):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be empty")
+    index = require_vector_index()
+    k = max(1, min(k, SIMILAR_MAX_K))
+    vector = await asyncio.to_thread(encode_query, q)
+    matches = await asyncio.to_thread(index.search, vector, k, VECTOR_NPROBE)
+    return FastJSONResponse({"tenders": await db_pool.run(fetch_scored_tenders, matches)})
+
+@app.get("/trends/regions/counts")
+async def get_region_counts(status: str = None, open_within_days: int = None):
+    return await trend_response(SUMMARY_REGION_COUNTS, LIVE_REGION_COUNTS, status, open_within_days)
+
+@app.get("/trends/sectors/counts")
+async def get_sector_counts(status: str = None, open_within_days: int = None):
+    return await trend_response(SUMMARY_SECTOR_COUNTS, LIVE_SECTOR_COUNTS, status, open_within_days)
 
 @app.get("/trends/months/counts")
-async def get_month_counts():
+async def get_month_counts(status: str = None, open_within_days: int = None):
+    return await trend_response(SUMMARY_MONTH_COUNTS, LIVE_MONTH_COUNTS, status, open_within_days)
+
+# Brotli when the client accepts it (falls back to gzip), otherwise gzip only
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+try:
+    from brotli_asgi import BrotliMiddleware as CompressionMiddleware
+except ImportError:
+    from starlette.middleware.gzip import GZipMiddleware as CompressionMiddleware
+
+# Response cache for read-only GET routes: route -> TTL in seconds.
+# Entries are keyed by data version + route + normalized query string, so a new load invalidates them everywhere.
+RESPONSE_CACHE_TTLS = {
+    "/trends/regions": 600,
+    "/trends/sectors": 600,
+    "/trends/regions/counts": 300,
+    "/trends/sectors/counts": 300,
+    "/trends/months/counts": 300,
+    "/public/regions/counts": 300,
+    "/public/sectors/counts": 300,
+    "/public/months/counts": 300,
+    "/tenders": 30,
+    "/tenders/search": 30,
+}
+CACHED_RESPONSE_HEADERS = ("content-type", "x-data-refreshed-at")
+
+response_cache = TTLCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    sizeof=lambda entry: len(entry["body"]),
+)
+# Second tier shared by all workers (SHARED_CACHE_URL, see shared_cache.py); None when not configured
+shared_cache = open_shared_cache()
+
+async def current_data_version():
+    version = _data_version_cache.get("version")
+    if version is None:
+        version = await db_pool.run(data_version)
+    return version
+
+def response_cache_key(request: Request, version):
+    params = tuple(sorted((k, v) for k, v in request.query_params.multi_items() if v != ""))
+    return (version, request.url.path, params)
+
+def shared_cache_key(key):
+    return "resp:" + hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+def encode_cache_entry(entry):
+    """Length-prefixed JSON metadata followed by the raw body, for the shared tier."""
+    meta = dumps({k: v for k, v in entry.items() if k != "body"})
+    return len(meta).to_bytes(4, "big") + meta + entry["body"]
+
+def decode_cache_entry(data):
+    size = int.from_bytes(data[:4], "big")
+    entry = orjson.loads(data[4:4 + size])
+    entry["body"] = data[4 + size:]
+    return entry
+
+def cached_response(request: Request, entry, cache_status):
+    headers = dict(entry["headers"])
+    headers.update({
+        "ETag": entry["etag"],
+        "Last-Modified": entry["last_modified"],
+        "Cache-Control": f"public, max-age={entry['max_age']}",
+        "X-Cache": cache_status,
+    })
+    if request.headers.get("if-none-match") in (entry["etag"], f"W/{entry['etag']}"):
+        headers.pop("content-type", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], headers=headers)
+
+async def response_cache_middleware(request: Request, call_next):
+    ttl = RESPONSE_CACHE_TTLS.get(request.url.path)
+    if request.method != "GET" or ttl is None or "authorization" in request.headers:
+        return await call_next(request)
+    # Hits return before routing sets scope["route"]; cacheable paths are their own route templates
+    request.scope["route_path"] = request.url.path
+
+    key = response_cache_key(request, await current_data_version())
+    entry = response_cache.get(key)
+    if entry is not None:
+        return cached_response(request, entry, "HIT")
+    if shared_cache is not None:
+        data = await asyncio.to_thread(shared_cache.get, shared_cache_key(key))
+        if data is not None:
+            entry = decode_cache_entry(data)
+            response_cache.set(key, entry, ttl=ttl)
+            return cached_response(request, entry, "HIT-SHARED")
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    refreshed_at = response.headers.get("x-data-refreshed-at")
+    modified = datetime.fromisoformat(refreshed_at) if refreshed_at else datetime.now(timezone.utc)
+    entry = {
+        "body": body,
+        "headers": {k: v for k, v in response.headers.items() if k in CACHED_RESPONSE_HEADERS},
+        "etag": '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+        "last_modified": format_datetime(modified.astimezone(timezone.utc), usegmt=True),
+        "max_age": int(ttl),
+    }
+    response_cache.set(key, entry, ttl=ttl)
+    if shared_cache is not None:
+        await asyncio.to_thread(shared_cache.set, shared_cache_key(key), encode_cache_entry(entry), ttl)
+    return cached_response(request, entry, "MISS")
+
+def invalidate_caches():
+    _data_version_cache.clear()
+    count_cache.clear()
+    response_cache.clear()
+    if shared_cache is not None:
+        shared_cache.clear()
+
+# Warm start: before taking traffic each worker requests the trend routes through its own middleware stack,
+# filling the response cache (and the shared tier, where the first worker's results serve the others)
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1") == "1"
+WARMUP_PATHS = [
+    "/trends/regions", "/trends/sectors",
+    "/trends/regions/counts", "/trends/sectors/counts", "/trends/months/counts",
+    "/public/regions/counts", "/public/sectors/counts", "/public/months/counts",
+]
+
+async def warm_up():
+    start = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for path in WARMUP_PATHS:
+            try:
+                await client.get(path)
+            except Exception as e:
+                print(f"Warm-up of {path} failed: {e}")
+    print(f"Warm-up of {len(WARMUP_PATHS)} routes took {time.perf_counter() - start:.2f}s")
+
+# Personalized feed: open tenders in the user's sectors and regions, precomputed into
+# user_feed_candidates by refresh_user_feed() / refresh_user_feeds() (see scripts/ld_csv_to_db.py)
+FEED_COLUMNS = ["id", "url", "title", "published_on", "closing_date", "region", "status", "predicted_category"]
+
+def rebuild_user_feed(username):
+    """Recompute one user's feed candidates; a failure only leaves the feed stale until the next refresh."""
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT refresh_user_feed(%s)", (username,))
+            conn.commit()
+    except psycopg2.Error as e:
+        print(f"Could not rebuild feed for {username}: {e}")
+
+def fetch_user_feed(username, limit, offset):
+    columns = select_list(FEED_COLUMNS, "t")
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute("""
-                SELECT 
-                    EXTRACT(YEAR FROM published_on) AS year,
-                    EXTRACT(MONTH FROM published_on) AS month,
-                    COUNT(*) AS count
-                FROM tenders
-                WHERE published_on IS NOT NULL
-                GROUP BY EXTRACT(YEAR FROM published_on), EXTRACT(MONTH FROM published_on)
-            """)
-            rows = cursor.fetchall()
-            return rows
+            cursor.execute(f"""
+                SELECT {columns}, c.score AS relevance
+                FROM user_feed_candidates c
+                JOIN tenders t ON t.id = c.tender_id
+                WHERE c.username = %s AND c.closing_date >= CURRENT_DATE
+                ORDER BY c.closing_date ASC, c.score DESC, c.tender_id
+                LIMIT %s OFFSET %s
+            """, (username, limit + 1, offset))
+            return cursor.fetchall()
+
+@app.get("/dashboard/feed")
+async def dashboard_feed(page: int = 1, per_page: int = 20, current_user: dict = Depends(get_current_user)):
+    per_page = max(1, min(per_page, 100))
+    rows = await db_pool.run(fetch_user_feed, current_user["username"], per_page, (max(page, 1) - 1) * per_page)
+    return FastJSONResponse({"tenders": rows[:per_page], "has_more": len(rows) > per_page})
+
+# Saved-search alerts: searches are compiled into one AlertMatcher (see alerts.py) and every tender added
+# since the last run goes through it once; matches land in alert_matches (tables created by scripts/ld_csv_to_db.py)
+ALERT_MATCH_BATCH = int(os.getenv("ALERT_MATCH_BATCH", "2000"))  # tenders fetched per server-side cursor batch
+SAVED_SEARCHES_PER_USER = int(os.getenv("SAVED_SEARCHES_PER_USER", "50"))
+SAVED_SEARCH_COLUMNS = ["id", "name", "keyword", "sectors", "regions", "created_at"]
+
+def with_keyword_lexemes(cursor, searches):
+    """
+    Add "terms" to each saved search: its keyword terms stemmed by the 'english' configuration,
+    stopwords dropped, i.e. what to_tsquery makes of them in build_tsquery().
+    """
+    terms = sorted({term for search in searches for term in keyword_terms(search["keyword"])})
+    lexemes = {}
+    if terms:
+        cursor.execute("""
+            SELECT term, tsvector_to_array(to_tsvector('english', term)) AS lexemes
+            FROM unnest(%s::text[]) AS term
+        """, (terms,))
+        lexemes = {row["term"]: row["lexemes"] for row in cursor.fetchall()}
+    return [
+        {**search, "terms": [lexeme for term in keyword_terms(search["keyword"]) for lexeme in lexemes[term]]}
+        for search in searches
+    ]
+
+def match_new_tenders():
+    """Match tenders added since the last run against every saved search; returns the number of new matches."""
+    matched = 0
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            # Row lock serializes concurrent runs (periodic task, loader hook)
+            cursor.execute("SELECT last_tender_id FROM alert_state FOR UPDATE")
+            from_id = cursor.fetchone()["last_tender_id"]
+            cursor.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM tenders")
+            to_id = cursor.fetchone()["max_id"]
+            if to_id > from_id:
+                cursor.execute("SELECT id, keyword, sectors, regions FROM saved_searches")
+                matcher = AlertMatcher(with_keyword_lexemes(cursor, cursor.fetchall()))
+                if len(matcher):
+                    with conn.cursor(name="alert_tenders", cursor_factory=RealDictCursor) as tenders:
+                        tenders.execute("""
+                            SELECT id, predicted_category, region, tsvector_to_array(search_vector) AS lexemes
+                            FROM tenders
+                            WHERE id > %s AND id <= %s
+                              AND (closing_date IS NULL OR closing_date >= CURRENT_DATE)
+                        """, (from_id, to_id))
+                        while batch := tenders.fetchmany(ALERT_MATCH_BATCH):
+                            pairs = matcher.match_batch(batch)
+                            if pairs:
+                                execute_values(
+                                    cursor,
+                                    "INSERT INTO alert_matches (search_id, tender_id) VALUES %s ON CONFLICT DO NOTHING",
+                                    pairs, page_size=1000,
+                                )
+                                matched += len(pairs)
+            cursor.execute("UPDATE alert_state SET last_tender_id = %s, matched_at = now()", (to_id,))
+        conn.commit()
+    return matched
+
+def fetch_saved_searches(username):
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(SAVED_SEARCH_COLUMNS)} FROM saved_searches WHERE username = %s ORDER BY id",
+                (username,),
+            )
+            return cursor.fetchall()
+
+def insert_saved_search(username, search: SavedSearchCreate):
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute("SELECT COUNT(*) AS count FROM saved_searches WHERE username = %s", (username,))
+            if cursor.fetchone()["count"] >= SAVED_SEARCHES_PER_USER:
+                raise HTTPException(status_code=400, detail=f"At most {SAVED_SEARCHES_PER_USER} saved searches per user")
+            cursor.execute(f"""
+                INSERT INTO saved_searches (username, name, keyword, sectors, regions)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING {', '.join(SAVED_SEARCH_COLUMNS)}
+            """, (username, search.name, search.keyword or None, search.sectors, search.regions))
+            row = cursor.fetchone()
+        conn.commit()
+    return row
+
+def delete_saved_search(username, search_id):
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM saved_searches WHERE id = %s AND username = %s", (search_id, username))
+            deleted = cursor.rowcount
+        conn.commit()
+    return deleted
+
+def fetch_alert_matches(username, search_id, limit, offset):
+    columns = select_list(TENDER_LIST_COLUMNS, "t")
+    conditions = ["s.username = %s"]
+    params = [username]
+    if search_id is not None:
+        conditions.append("s.id = %s")
+        params.append(search_id)
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(f"""
+                SELECT {columns}, s.id AS search_id, s.name AS search_name, m.matched_at
+                FROM saved_searches s
+                JOIN alert_matches m ON m.search_id = s.id
+                JOIN tenders t ON t.id = m.tender_id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY m.matched_at DESC, m.tender_id DESC
+                LIMIT %s OFFSET %s
+            """, (*params, limit + 1, offset))
+            return cursor.fetchall()
+
+@app.get("/alerts")
+async def list_saved_searches(current_user: dict = Depends(get_current_user)):
+    return FastJSONResponse(await db_pool.run(fetch_saved_searches, current_user["username"]))
+
+@app.post("/alerts", status_code=status.HTTP_201_CREATED)
+async def create_saved_search(search: SavedSearchCreate, current_user: dict = Depends(get_current_user)):
+    if not (keyword_terms(search.keyword) or search.sectors or search.regions):
+        raise HTTPException(status_code=400, detail="A saved search needs a keyword, sectors or regions")
+    row = await db_pool.run(insert_saved_search, current_user["username"], search)
+    return FastJSONResponse(row, status_code=status.HTTP_201_CREATED)
+
+@app.delete("/alerts/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_saved_search(search_id: int, current_user: dict = Depends(get_current_user)):
+    if not await db_pool.run(delete_saved_search, current_user["username"], search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@app.get("/alerts/matches")
+async def alert_matches(search_id: Optional[int] = None, page: int = 1, per_page: int = 20,
+                        current_user: dict = Depends(get_current_user)):
+    per_page = max(1, min(per_page, 100))
+    rows = await db_pool.run(
+        fetch_alert_matches, current_user["username"], search_id, per_page, (max(page, 1) - 1) * per_page
+    )
+    return FastJSONResponse({"tenders": rows[:per_page], "has_more": len(rows) > per_page})
+
+# Profile update: the cached principal is dropped so the next request sees the new profile
+@app.patch("/users/me", response_model=dict)
+def update_profile(update: UserProfileUpdate, current_user: dict = Depends(get_current_user)):
+    changes = update.model_dump(exclude_unset=True)
+    if not changes:
+        return current_user
+    assignments = sql.SQL(", ").join(
+        sql.SQL("{} = %s").format(sql.Identifier(column)) for column in changes
+    )
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                sql.SQL("UPDATE users SET {} WHERE username = %s").format(assignments),
+                [*changes.values(), current_user["username"]],
+            )
+        conn.commit()
+    invalidate_user(current_user["username"])
+    if "sectors" in changes or "region_focus" in changes:
+        rebuild_user_feed(current_user["username"])
+    return load_principal(current_user["username"])
 
 # Protected endpoint example
 @app.get("/dashboard", response_model=dict)
 async def dashboard(current_user: dict = Depends(get_current_user)):
-    return {"message": f"Welcome, {current_user['username']}!", "user": current_user}
\ No newline at end of file
+    return {"message": f"Welcome, {current_user['username']}!", "user": current_user}
+
+# Operator endpoints
+@app.get("/admin/pool", dependencies=[Depends(require_admin)])
+def pool_stats():
+    return db_pool.stats()
+
+@app.get("/admin/passwords", dependencies=[Depends(require_admin)])
+def password_stats():
+    return password_pool.stats()
+
+@app.post("/admin/trends/refresh", dependencies=[Depends(require_admin)])
+async def refresh_trends():
+    return {"refreshed_at": await db_pool.run(refresh_trend_summaries)}
+
+@app.get("/admin/caches", dependencies=[Depends(require_admin)])
+def cache_stats():
+    stats = {"counts": count_cache.stats(), "responses": response_cache.stats(), "users": user_cache_stats()}
+    if shared_cache is not None:
+        stats["shared"] = shared_cache.stats()
+    return stats
+
+# Picks up an index rebuilt by scripts/build_vector_index.py without a restart
+@app.post("/admin/vector-index/reload", dependencies=[Depends(require_admin)])
+def reload_vector_index():
+    index = load_vector_index()
+    return {"loaded": index is not None, "vectors": len(index) if index is not None else 0}
+
+# Also called by scripts/ld_csv_to_db.py when a load finishes
+@app.post("/admin/alerts/match", dependencies=[Depends(require_admin)])
+async def run_alert_matching():
+    return {"matched": await db_pool.run(match_new_tenders)}
+
+# Prometheus scrape target: per-route latency / DB / serialization histograms plus pool and cache gauges
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+register_stats("db_pool", db_pool.stats)
+register_stats("password_pool", password_pool.stats)
+register_stats("count_cache", count_cache.stats)
+register_stats("response_cache", response_cache.stats)
+register_stats("user_cache", user_cache_stats)
+if shared_cache is not None:
+    register_stats("shared_cache", shared_cache.stats)
+
+# Called by scripts/ld_csv_to_db.py when a load finishes
+@app.post("/admin/caches/invalidate", dependencies=[Depends(require_admin)])
+def invalidate_cache():
+    invalidate_caches()
+    return {"invalidated": True}
+
+# Middleware: the last one added is the outermost, so CORS headers also reach cached responses
+# and the cache stores uncompressed bodies that are compressed per client on the way out
+app.add_middleware(BaseHTTPMiddleware, dispatch=response_cache_middleware)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["https://tender-trend.vercel.app"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+# Outermost of all: timings cover compression, CORS and cache hits, and bytes are counted as sent
+app.add_middleware(MetricsMiddleware)
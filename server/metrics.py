@@ -0,0 +1,262 @@
+"""
+Request-level performance instrumentation, exported in Prometheus format on /metrics.
+
+MetricsMiddleware times every request and, for a sampled fraction of them, keeps a RequestStats
+in a context variable that the rest of the stack adds to:
+    - InstrumentedConnection (db.py's connection_factory) times cursor execute / fetch calls,
+      counts the rows fetched and remembers the normalized SQL
+    - DatabasePool.getconn records how long the connection checkout took
+    - FastJSONResponse.render records serialization time
+Context variables follow requests into db_pool.run / threadpool workers, so the blocking DB
+code needs no extra arguments. Slow requests are logged as one JSON line with that context.
+
+Under serve.py with several workers PROMETHEUS_MULTIPROC_DIR is set: histograms and counters are
+then aggregated across workers, while the pool / cache gauges describe the worker that served
+the scrape.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import time
+from contextvars import ContextVar
+
+import psycopg2.extensions
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))  # fraction of requests with DB / serialization breakdown
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))          # log requests slower than this (0 disables)
+SLOW_REQUEST_MAX_QUERIES = 10                                          # statements kept per request for the slow log
+# Parameters can hold credentials and personal data (emails, password hashes): by default the slow log
+# only records their types. Set to 1 to log the values (truncated) while debugging.
+SLOW_REQUEST_LOG_PARAMS = os.getenv("SLOW_REQUEST_LOG_PARAMS", "0") == "1"
+EXCLUDED_PATHS = {"/metrics"}
+
+logger = logging.getLogger("tenders.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency", ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+DB_SECONDS = Histogram("http_request_db_seconds", "Time spent in cursor execute / fetch per request", ["route"], buckets=LATENCY_BUCKETS)
+ACQUIRE_SECONDS = Histogram(
+    "http_request_pool_acquire_seconds", "Time spent waiting for a pooled connection per request", ["route"], buckets=LATENCY_BUCKETS
+)
+SERIALIZE_SECONDS = Histogram(
+    "http_request_serialize_seconds", "Time spent rendering JSON per request", ["route"], buckets=LATENCY_BUCKETS
+)
+ROWS = Histogram("http_response_rows", "Database rows fetched per request", ["route"], buckets=(0, 1, 10, 100, 1000, 10000, 100000))
+RESPONSE_BYTES = Histogram(
+    "http_response_bytes", "Response body bytes sent", ["route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+SLOW_REQUESTS = Counter("http_slow_requests_total", "Requests slower than SLOW_REQUEST_MS", ["route"])
+
+
+class RequestStats:
+    __slots__ = ("db_seconds", "acquire_seconds", "serialize_seconds", "rows", "queries")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.acquire_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.rows = 0
+        self.queries = []
+
+
+current_stats: ContextVar = ContextVar("request_stats", default=None)
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_sql(query):
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    elif not isinstance(query, str):
+        query = str(query)  # psycopg2.sql.Composed
+    return _whitespace.sub(" ", query).strip()[:500]
+
+
+def describe_params(vars):
+    """Query parameters as the slow log records them: type names only unless SLOW_REQUEST_LOG_PARAMS."""
+    if vars is None:
+        return None
+    if SLOW_REQUEST_LOG_PARAMS:
+        text = repr(vars)
+        return vars if len(text) <= 300 else f"{text[:300]}..."
+    if isinstance(vars, dict):
+        return {name: type(value).__name__ for name, value in vars.items()}
+    return [type(value).__name__ for value in vars]
+
+
+def record_acquire(seconds):
+    stats = current_stats.get()
+    if stats is not None:
+        stats.acquire_seconds += seconds
+
+
+def record_serialize(seconds):
+    stats = current_stats.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
+
+
+class _TimedCursorMixin:
+    """Adds timing and row counting to any psycopg2 cursor class; a no-op outside sampled requests."""
+
+    def execute(self, query, vars=None):
+        stats = current_stats.get()
+        if stats is None:
+            return super().execute(query, vars)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            stats.db_seconds += time.perf_counter() - start
+            if len(stats.queries) < SLOW_REQUEST_MAX_QUERIES:
+                stats.queries.append({"sql": normalize_sql(query), "params": describe_params(vars)})
+
+    def _timed_fetch(self, fetch, *args):
+        stats = current_stats.get()
+        if stats is None:
+            return fetch(*args)
+        start = time.perf_counter()
+        rows = fetch(*args)
+        stats.db_seconds += time.perf_counter() - start
+        stats.rows += len(rows) if isinstance(rows, list) else int(rows is not None)
+        return rows
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+
+_timed_cursor_classes = {}
+
+
+def _timed_cursor_class(base):
+    cls = _timed_cursor_classes.get(base)
+    if cls is None:
+        cls = _timed_cursor_classes[base] = type(f"Timed{base.__name__}", (_TimedCursorMixin, base), {})
+    return cls
+
+
+class InstrumentedConnection(psycopg2.extensions.connection):
+    """Connection whose cursors (any cursor_factory, named or not) report to the current request."""
+
+    def cursor(self, *args, **kwargs):
+        base = kwargs.get("cursor_factory") or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs["cursor_factory"] = _timed_cursor_class(base)
+        return super().cursor(*args, **kwargs)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: times the whole exchange, including streamed bodies, and counts bytes sent."""
+
+    def __init__(self, app, sample_rate=METRICS_SAMPLE_RATE, slow_request_ms=SLOW_REQUEST_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_request_ms / 1000.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        stats = RequestStats() if sampled else None
+        token = current_stats.set(stats)
+        status = 500
+        sent_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, sent_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_stats.reset(token)
+            self.observe(scope, status, elapsed, sent_bytes, stats)
+
+    def observe(self, scope, status, elapsed, sent_bytes, stats):
+        # Label by route template (/tenders/{tender_id}) so ids don't explode the label space
+        # (response-cache hits never reach the router and set route_path instead)
+        route = getattr(scope.get("route"), "path", None) or scope.get("route_path") or "unmatched"
+        REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(elapsed)
+        RESPONSE_BYTES.labels(route).observe(sent_bytes)
+        if stats is not None:
+            DB_SECONDS.labels(route).observe(stats.db_seconds)
+            ACQUIRE_SECONDS.labels(route).observe(stats.acquire_seconds)
+            SERIALIZE_SECONDS.labels(route).observe(stats.serialize_seconds)
+            ROWS.labels(route).observe(stats.rows)
+        if self.slow_seconds and elapsed >= self.slow_seconds:
+            SLOW_REQUESTS.labels(route).inc()
+            entry = {
+                "event": "slow_request",
+                "method": scope["method"],
+                "route": route,
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 1),
+                "bytes": sent_bytes,
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "sampled": stats is not None,
+            }
+            if stats is not None:
+                entry.update({
+                    "db_ms": round(stats.db_seconds * 1000, 1),
+                    "acquire_ms": round(stats.acquire_seconds * 1000, 1),
+                    "serialize_ms": round(stats.serialize_seconds * 1000, 1),
+                    "rows": stats.rows,
+                    "queries": stats.queries,
+                })
+            logger.warning(json.dumps(entry, default=str))
+
+
+class StatsCollector:
+    """Exposes a `stats()` dict (connection pool, caches) as gauges, read at scrape time."""
+
+    def __init__(self, prefix, stats):
+        self.prefix = prefix
+        self.stats = stats
+
+    def collect(self):
+        for key, value in self.stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                gauge = GaugeMetricFamily(f"{self.prefix}_{key}", f"{self.prefix} {key.replace('_', ' ')}")
+                gauge.add_metric([], value)
+                yield gauge
+
+
+_stats_collectors = []
+
+
+def register_stats(prefix, stats):
+    collector = StatsCollector(prefix, stats)
+    _stats_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def render_metrics():
+    """(body, content type) for the /metrics endpoint."""
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _stats_collectors:
+        registry.register(collector)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
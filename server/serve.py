@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Production entry point: runs main:app under uvicorn with WEB_WORKERS processes.
+
+With more than one worker:
+- Prometheus metrics switch to multiprocess mode (PROMETHEUS_MULTIPROC_DIR, wiped on start)
+  so /metrics aggregates every worker.
+- SHARED_CACHE_URL defaults to a memory-mapped SQLite file in the temp dir, so cached responses
+  are shared instead of being rebuilt per worker. Point it at redis:// to share across hosts.
+Every worker warms the trend routes in its lifespan before accepting requests (WARMUP_ON_START).
+Each worker has its own connection pool: Postgres sees up to WEB_WORKERS * DB_POOL_MAX_SIZE connections.
+
+Usage (from server/):
+    WEB_WORKERS=4 PORT=8000 python serve.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
+
+
+def main():
+    if WEB_WORKERS > 1:
+        # Must be set before the workers import prometheus_client
+        metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "tenders-metrics"))
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir)
+        os.environ.setdefault("SHARED_CACHE_URL", "file://" + os.path.join(tempfile.gettempdir(), "tenders-shared-cache.db"))
+        # Create the file cache's schema once here, before the workers start and race for it
+        from shared_cache import open_shared_cache
+        open_shared_cache(os.environ["SHARED_CACHE_URL"])
+    uvicorn.run("main:app", host=HOST, port=PORT, workers=WEB_WORKERS, log_level=LOG_LEVEL, proxy_headers=True)
+
+
+if __name__ == "__main__":
+    main()
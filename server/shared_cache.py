@@ -0,0 +1,146 @@
+"""
+Optional cache tier shared by every server worker (see serve.py), behind the in-process caches.
+
+SHARED_CACHE_URL picks the backend:
+    redis://host:6379/0        any Redis-compatible server (needs the `redis` package)
+    file:///tmp/tenders.db     SQLite file in WAL mode read through a memory map; no extra process,
+                               shared by the workers of one host
+Unset, there is no shared tier and each worker keeps its own caches.
+
+Values are bytes with a TTL. Backend errors are counted and treated as misses, so the shared tier
+can slow a request down by at most its timeout and never fails it.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL")
+SHARED_CACHE_TIMEOUT = float(os.getenv("SHARED_CACHE_TIMEOUT", "0.2"))  # seconds per Redis call
+FILE_CACHE_MMAP_BYTES = 256 * 1024 * 1024
+FILE_CACHE_SETUP_TIMEOUT = 10.0  # seconds to wait for the lock while workers starting together create the schema
+
+
+class RedisSharedCache:
+    def __init__(self, url, prefix="tenders:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=SHARED_CACHE_TIMEOUT, socket_connect_timeout=SHARED_CACHE_TIMEOUT)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    def clear(self):
+        batch = []
+        for key in self.client.scan_iter(match=self.prefix + "*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+class FileSharedCache:
+    """SQLite-backed store; WAL lets every worker read while one writes, mmap keeps reads out of syscalls."""
+
+    PURGE_EVERY = 256  # sets between sweeps of expired rows
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        # Setup takes write locks; it gets a longer busy timeout than cache calls so that workers
+        # starting at the same moment wait for each other instead of failing with "database is locked"
+        conn = sqlite3.connect(path, timeout=FILE_CACHE_SETUP_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL) WITHOUT ROWID")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=SHARED_CACHE_TIMEOUT, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={FILE_CACHE_MMAP_BYTES}")
+            conn.execute("PRAGMA synchronous=OFF")  # a cache: losing the tail on power loss is fine
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute("SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)", (key, time.time() + ttl, value))
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+
+class SharedCache:
+    """Error-tolerant front for a backend, with hit / miss / error counters."""
+
+    def __init__(self, backend, url):
+        self.backend = backend
+        self.url = url
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, ttl):
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception:
+            self.errors += 1
+
+    def clear(self):
+        try:
+            self.backend.clear()
+        except Exception:
+            self.errors += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def open_shared_cache(url=SHARED_CACHE_URL):
+    """SharedCache for `url`, or None when no shared tier is configured."""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return SharedCache(RedisSharedCache(url), url)
+    if parsed.scheme == "file":
+        return SharedCache(FileSharedCache(parsed.path), url)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL scheme: {parsed.scheme}")
@@ -0,0 +1,168 @@
+"""
+CPU-only inverted-file (IVF) index over tender title embeddings.
+
+On-disk layout (one directory, every array memory-mapped on load):
+    centroids.npy  float32 (nlist, dim)   unit-length cluster centroids
+    offsets.npy    int64   (nlist + 1,)   vectors of list i live in rows offsets[i]:offsets[i + 1]
+    vectors.npy    float16 (n, dim)       unit-length embeddings, grouped by list
+    ids.npy        int64   (n,)           tender id of each row in vectors.npy
+
+Vectors are normalized, so inner product == cosine similarity.
+
+Builds never write into a directory a server may have mapped: each one goes to a fresh sibling
+`<index_dir>.<version>`, and publish() then points `index_dir` (a symlink) at it atomically.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+BLOCK_ROWS = 65536  # rows scored per block when assigning / brute-forcing, bounds temporary memory
+
+
+def normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _assign(vectors, centroids):
+    """Index of the closest centroid for every row, computed block by block."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = normalize(vectors[start:start + BLOCK_ROWS])
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors, nlist, iterations=20, sample_size=100_000, seed=0):
+    """Spherical k-means on a random sample of the vectors."""
+    rng = np.random.default_rng(seed)
+    sample_idx = rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)
+    sample = normalize(vectors[np.sort(sample_idx)])
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        # Re-seed empty clusters from random sample points
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    def __init__(self, centroids, offsets, vectors, ids):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.vectors = vectors
+        self.ids = ids
+        self._id_order = np.argsort(ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self):
+        return self.centroids.shape[1]
+
+    @classmethod
+    def build(cls, vectors, ids, out_dir, nlist=None, iterations=20, sample_size=100_000):
+        """Cluster `vectors` (any float dtype, may be a memmap) and write the index to `out_dir`."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        ids = np.asarray(ids, dtype=np.int64)
+        nlist = nlist or max(1, int(np.sqrt(len(vectors))))
+        centroids = train_centroids(vectors, nlist, iterations, sample_size)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+
+        out = np.lib.format.open_memmap(out_dir / "vectors.npy", mode="w+", dtype=np.float16, shape=(len(vectors), vectors.shape[1]))
+        for start in range(0, len(order), BLOCK_ROWS):
+            rows = order[start:start + BLOCK_ROWS]
+            out[start:start + len(rows)] = normalize(vectors[rows])
+        out.flush()
+        del out
+        np.save(out_dir / "centroids.npy", centroids.astype(np.float32))
+        np.save(out_dir / "offsets.npy", offsets)
+        np.save(out_dir / "ids.npy", ids[order])
+        return cls.load(out_dir)
+
+    @classmethod
+    def load(cls, index_dir):
+        # Resolve the symlink once so every array comes from the same build, even mid-publish
+        index_dir = Path(index_dir).resolve()
+        return cls(
+            centroids=np.load(index_dir / "centroids.npy"),
+            offsets=np.load(index_dir / "offsets.npy"),
+            vectors=np.load(index_dir / "vectors.npy", mmap_mode="r"),
+            ids=np.load(index_dir / "ids.npy", mmap_mode="r"),
+        )
+
+    def vector_for_id(self, tender_id):
+        pos = np.searchsorted(self.ids, tender_id, sorter=self._id_order)
+        if pos >= len(self.ids) or self.ids[self._id_order[pos]] != tender_id:
+            return None
+        return np.asarray(self.vectors[self._id_order[pos]], dtype=np.float32)
+
+    def search(self, query, k=10, nprobe=8, exclude_id=None):
+        """Top-k (tender_id, cosine similarity) pairs, scanning the `nprobe` closest lists."""
+        query = normalize(query)
+        nprobe = min(nprobe, len(self.centroids))
+        lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        best_ids, best_scores = [], []
+        for lst in lists:
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if start == end:
+                continue
+            best_scores.append(np.asarray(self.vectors[start:end], dtype=np.float32) @ query)
+            best_ids.append(np.asarray(self.ids[start:end]))
+        if not best_ids:
+            return []
+        ids = np.concatenate(best_ids)
+        scores = np.concatenate(best_scores)
+        if exclude_id is not None:
+            scores[ids == exclude_id] = -np.inf
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def brute_force(self, query, k=10, exclude_id=None):
+        """Exact top-k over every vector; the reference for recall measurements."""
+        query = normalize(query)
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), BLOCK_ROWS):
+            scores[start:start + BLOCK_ROWS] = np.asarray(self.vectors[start:start + BLOCK_ROWS], dtype=np.float32) @ query
+        if exclude_id is not None:
+            scores[np.asarray(self.ids) == exclude_id] = -np.inf
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+
+def publish(build_dir, index_dir):
+    """
+    Atomically point the `index_dir` symlink at `build_dir`, a sibling directory holding a finished
+    build. The build it replaced is kept (servers may still map it until they reload); older ones are
+    removed. A plain directory left by an older build is first moved aside as a version of its own.
+    """
+    build_dir, index_dir = Path(build_dir), Path(index_dir)
+    previous = None
+    if index_dir.is_symlink():
+        previous = index_dir.resolve()
+    elif index_dir.exists():
+        previous = index_dir.with_name(f"{index_dir.name}.legacy")
+        index_dir.rename(previous)
+    link = index_dir.with_name(f".{index_dir.name}.link")
+    link.unlink(missing_ok=True)
+    link.symlink_to(build_dir.name)
+    os.replace(link, index_dir)
+    for version in index_dir.parent.glob(f"{index_dir.name}.*"):
+        if version.is_dir() and version.resolve() not in (build_dir.resolve(), previous):
+            shutil.rmtree(version)